@@ -40,5 +40,7 @@ class MovementAction(Action):
             return
         if not engine.game_map.tiles.walkable[dest.y, dest.x]:
             return
+        if engine.entities.blocking_at(dest):
+            return
 
         entity.move(self.dy, self.dx)
@@ -4,7 +4,10 @@ from tcod.console import Console
 from tcod.context import Context
 
 from entity import Entity
+from entity_index import EntityIndex
 from game_map import GameMap
+from game_map.areas.tiles.supplementaries import Point
+from game_map.fov import FieldOfView
 
 from input_handlers import EventHandler
 from renderer import Renderer
@@ -18,11 +21,19 @@ class Engine:
         game_map: GameMap,
         player: Entity,
     ):
-        self.entities = entities
+        self.entities = EntityIndex(game_map.size)
+        self.entities.update(entities)
         self.event_handler = event_handler
         self.game_map = game_map
         self.player = player
-        self.renderer = Renderer(game_map)
+        self.fov = FieldOfView(game_map)
+        self.renderer = Renderer(game_map, self.fov)
+        # The rooms are drawn into the map before the first field of view.
+        self.renderer.update()
+        self.update_fov()
+
+    def update_fov(self) -> None:
+        self.fov.update(Point(self.player.y, self.player.x))
 
     def handle_events(self, events: Iterable[Any]) -> None:
         for event in events:
@@ -31,13 +42,9 @@ class Engine:
             if action is None:
                 continue
             action.perform(self, self.player)
+            self.update_fov()
 
     def render(self, console: Console, context: Context) -> None:
-        self.renderer.render_console(console)
-
-        for entity in self.entities:
-            console.print(y=entity.y, x=entity.x, string=entity.char, fg=entity.color)
+        self.renderer.render_console(console, self.entities)
 
         context.present(console)
-
-        console.clear()
@@ -1,4 +1,9 @@
-from typing import Tuple
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Tuple
+
+if TYPE_CHECKING:
+    from entity_index import EntityIndex
 
 
 class Entity:
@@ -6,12 +11,25 @@ class Entity:
     A generic object to represent players, enemies, items, etc.
     """
 
-    def __init__(self, y: int, x: int, char: str, color: Tuple[int, int, int]):
+    def __init__(
+        self,
+        y: int,
+        x: int,
+        char: str,
+        color: Tuple[int, int, int],
+        blocks_movement: bool = False,
+    ):
         self.y = y
         self.x = x
         self.char = char
         self.color = color
+        self.blocks_movement = blocks_movement
+        # The index the entity is in, kept up to date by move.
+        self.index: Optional[EntityIndex] = None
 
     def move(self, dy: int, dx: int) -> None:
+        y, x = self.y, self.x
         self.y += dy
         self.x += dx
+        if self.index is not None:
+            self.index.move(self, y, x)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Set, Tuple
+
+from game_map.areas.tiles.supplementaries import Point, Rectangle
+
+if TYPE_CHECKING:
+    from entity import Entity
+
+
+class EntityIndex:
+    """Spatial hash of the entities on a map. The entities are kept by their
+    positions for constant time lookups and in square buckets of the map for
+    range queries, which visit only the buckets overlapping the range. The
+    index is updated by Entity.move, so the positions of the indexed entities
+    must not be changed otherwise."""
+
+    def __init__(self, size: Tuple[int, int], bucket_size: int = 16):
+        self.size = size
+        self.bucket_size = bucket_size
+        self._positions: Dict[Tuple[int, int], List[Entity]] = {}
+        self._buckets: Dict[Tuple[int, int], Set[Entity]] = {}
+        self._entities: Set[Entity] = set()
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def __contains__(self, entity: Entity) -> bool:
+        return entity in self._entities
+
+    def __iter__(self) -> Iterator[Entity]:
+        return iter(self._entities)
+
+    def _bucket(self, y: int, x: int) -> Tuple[int, int]:
+        return y // self.bucket_size, x // self.bucket_size
+
+    def _insert(self, entity: Entity, y: int, x: int) -> None:
+        self._positions.setdefault((y, x), []).append(entity)
+        self._buckets.setdefault(self._bucket(y, x), set()).add(entity)
+
+    def _delete(self, entity: Entity, y: int, x: int) -> None:
+        at = self._positions[y, x]
+        at.remove(entity)
+        if not at:
+            del self._positions[y, x]
+        key = self._bucket(y, x)
+        bucket = self._buckets[key]
+        bucket.discard(entity)
+        if not bucket:
+            del self._buckets[key]
+
+    def add(self, entity: Entity) -> None:
+        if entity in self._entities:
+            return
+        if entity.index is not None:
+            entity.index.remove(entity)
+        self._entities.add(entity)
+        self._insert(entity, entity.y, entity.x)
+        entity.index = self
+
+    def update(self, entities: Iterable[Entity]) -> None:
+        for entity in entities:
+            self.add(entity)
+
+    def remove(self, entity: Entity) -> None:
+        if entity not in self._entities:
+            return
+        self._entities.remove(entity)
+        self._delete(entity, entity.y, entity.x)
+        entity.index = None
+
+    def move(self, entity: Entity, y: int, x: int) -> None:
+        """Moves the indexed entity from the position (y, x) to its current
+        position."""
+        if (y, x) == (entity.y, entity.x):
+            return
+        self._delete(entity, y, x)
+        self._insert(entity, entity.y, entity.x)
+
+    def at(self, position: Point) -> List[Entity]:
+        """Returns the entities at the position."""
+        return list(self._positions.get((position.y, position.x), ()))
+
+    def blocking_at(self, position: Point) -> bool:
+        """Checks whether an entity at the position blocks movement."""
+        return any(
+            entity.blocks_movement
+            for entity in self._positions.get((position.y, position.x), ())
+        )
+
+    def in_rectangle(self, rectangle: Rectangle) -> Iterator[Entity]:
+        """Yields the entities inside the rectangle."""
+        rectangle = rectangle.intersection(Rectangle(Point(0, 0), self.size))
+        if rectangle.is_empty():
+            return
+        start = self._bucket(rectangle.origin.y, rectangle.origin.x)
+        end = self._bucket(rectangle.end.y - 1, rectangle.end.x - 1)
+        for by in range(start[0], end[0] + 1):
+            for bx in range(start[1], end[1] + 1):
+                for entity in self._buckets.get((by, bx), ()):
+                    if (
+                        rectangle.origin.y <= entity.y < rectangle.end.y
+                        and rectangle.origin.x <= entity.x < rectangle.end.x
+                    ):
+                        yield entity
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 import random
-from copy import deepcopy, copy
 from typing import List, Union, Tuple
 
+import numpy as np
+from numpy.typing import NDArray
 from tcod.console import Console
 
 from game_map.areas.simple_area import SimpleArea
-from game_map.areas.tiles.supplementaries import Point
+from game_map.areas.tiles.supplementaries import Point, Rectangle
 from game_map.direction.direction import Direction
 
 
@@ -20,6 +21,39 @@ class Area(SimpleArea):
         super().__init__(size, origin)
         self.children = []
         self.postfilter = []
+        # Regions in local coordinates changed since the last draw.
+        self.dirty: List[Rectangle] = []
+        self.mark_dirty()
+
+    def mark_dirty(self, region: Rectangle = None) -> None:
+        """Marks a region as changed so it is redrawn by the next draw. The
+        whole area is marked by default."""
+        self.version += 1
+        whole = Rectangle(Point(0, 0), self.size)
+        if region is None or region.contains(whole):
+            self.dirty = [whole]
+        elif not any(dirty.contains(region) for dirty in self.dirty):
+            self.dirty.append(region)
+
+    def fill(self, fill_value) -> None:
+        super().fill(fill_value)
+        self.mark_dirty()
+
+    def fill_border(self, fill_value) -> None:
+        super().fill_border(fill_value)
+        self.mark_dirty()
+
+    def fill_in(self, area: SimpleArea) -> None:
+        super().fill_in(area)
+        self.mark_dirty(Rectangle(area.origin, area.size))
+
+    def fill_out(self, area: SimpleArea) -> None:
+        super().fill_out(area)
+        self.mark_dirty(Rectangle(area.origin, area.size))
+
+    def set_mask(self, mask: NDArray[np.bool_]) -> None:
+        super().set_mask(mask)
+        self.mark_dirty()
 
     def place_in(self, area: SimpleArea, force: bool = False) -> None:
         """Places another areas inside the tiles."""
@@ -27,22 +61,46 @@ class Area(SimpleArea):
             raise ValueError("Area to insert does not fit inside the tiles.")
         self.children.append(area)
         self.set_unplaceable(area.uncover())
+        self.mark_dirty(Rectangle(area.origin, area.size))
 
     def remove(self, area: Area) -> Union[Area, None]:
         if area in self.children:
             self.children.remove(area)
         return None
 
-    def draw_children(self):
+    def draw_children(self) -> List[Rectangle]:
+        """Merges the children into the tiles where anything changed since the
+        last draw. Every child overlapping a changed region is merged again in
+        order, so the result is the same as merging all of them. Returns the
+        changed regions."""
         for child in self.children:
-            child.draw_children()
-            self.fill_in(child)
+            for region in child.draw_children():
+                self.mark_dirty(region.moved(child.origin))
+        regions, self.dirty = self.dirty, []
+        bbox = Rectangle(Point(0, 0), self.size)
+        for region in regions:
+            region = region.intersection(bbox)
+            for child in self.children:
+                self._draw_child(child, region)
+        if regions:
+            self.invalidate()
+        return regions
+
+    def _draw_child(self, child: SimpleArea, region: Rectangle) -> None:
+        overlap = region.intersection(Rectangle(child.origin, child.size))
+        if overlap.is_empty():
+            return
+        self.tiles.merge(
+            overlap.origin,
+            child.tiles.window(overlap.origin - child.origin, overlap.size),
+        )
 
     def place_in_randomly(
-        self, place_points: List[Point], area: SimpleArea
+        self, place_points: NDArray[np.int32], area: SimpleArea
     ) -> bool:
+        """Places the area at a random origin from the given origins."""
         if len(place_points) != 0:
-            p = random.choice(place_points)
+            p = Point.from_tuple(random.choice(place_points))
             area.origin = p
             self.place_in(area)
             return True
@@ -65,18 +123,33 @@ class Area(SimpleArea):
         to_place: SimpleArea,
         neighbour: SimpleArea,
         direction: Direction = None,
-    ) -> List[Point]:
+    ) -> NDArray[np.int32]:
         """Fits in another area next to a given child of this area."""
         if direction is None:
             direction = Direction.get_random_direction()
         if neighbour not in self.children:
             raise ValueError("Neighbour not in children.")
 
+        # Only the origins where to_place touches the neighbour matter, so the
+        # search runs on a window around the neighbour instead of a clone.
+        p = neighbour.origin
+        window_origin = Point(
+            max(0, p.y - to_place.h + 1), max(0, p.x - to_place.w + 1)
+        )
+        window_size = (
+            min(self.h, p.y + neighbour.h + to_place.h - 1) - window_origin.y,
+            min(self.w, p.x + neighbour.w + to_place.w - 1) - window_origin.x,
+        )
+        window = SimpleArea.create_from_tiles(
+            self.tiles.window(window_origin, window_size)
+        )
+        local_neighbour = SimpleArea.create_from_tiles(neighbour.tiles)
+        local_neighbour.origin = p - window_origin
         frontier = SimpleArea.create_from_tiles(
             neighbour.tiles.frontier_in_direction(direction)
         )
-        frontier.origin = copy(neighbour.origin)
-        clone = deepcopy(self)
-        clone.fill_out(neighbour)
-        clone.fill_in(frontier)
-        return clone.fit_in_direction(to_place, frontier, (direction,))
+        frontier.origin = p - window_origin
+        window.fill_out(local_neighbour)
+        window.fill_in(frontier)
+        origins = window.fit_in_direction(to_place, frontier, (direction,))
+        return origins + (window_origin.y, window_origin.x)
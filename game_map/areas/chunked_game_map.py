@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+import tile_types
+from game_map.areas.game_map import GameMap
+from game_map.areas.simple_area import SimpleArea
+from game_map.areas.tiles.chunked_tiles import ChunkedTiles
+from game_map.areas.tiles.supplementaries import Point, Rectangle
+
+
+class ChunkedGameMap(GameMap):
+    """Game map whose tiles are kept out of core in chunks of a memory mapped
+    file with only the recently used chunks in memory. Placing rooms, fitting
+    them next to each other, drawing the children and the windowed queries
+    work across the chunk boundaries. The queries over the whole map, e.g.
+    the placement index, are not available."""
+
+    def __init__(
+        self,
+        size: Tuple[int, int],
+        path: str,
+        chunk_size: int = 256,
+        max_resident: int = 64,
+    ):
+        super().__init__((0, 0))
+        self.tiles = ChunkedTiles(
+            size, path, chunk_size, max_resident, tile_types.wall
+        )
+        # The chunks are filled already, there is nothing to draw.
+        self.dirty = []
+        self.invalidate()
+
+    @property
+    def placement_index(self) -> None:
+        return None
+
+    def flush(self) -> None:
+        """Writes the modified chunks into the file."""
+        self.tiles.flush()
+
+    def volume(self) -> int:
+        if self._volume is None:
+            self._volume = self.tiles.count("mask")
+        return self._volume
+
+    def placeable_count(self) -> int:
+        if self._placeable_count is None:
+            self._placeable_count = self.tiles.count("placeable")
+        return self._placeable_count
+
+    def is_placable(self, area: SimpleArea) -> bool:
+        return self.tiles.is_placable(area.origin, area.tiles)
+
+    def set_unplaceable(self, area: SimpleArea) -> None:
+        changed = self.tiles.set_unplaceable(area.origin, area.tiles)
+        if self._placeable_count is not None:
+            self._placeable_count -= changed
+
+    def fill_out(self, area: SimpleArea) -> None:
+        self.tiles.subtract_mask(area.origin, area.tiles)
+        self._volume = None
+        self._placeable_count = None
+        self.mark_dirty(Rectangle(area.origin, area.size))
+
+    def fit_in(self, to_fit: SimpleArea) -> NDArray[np.int32]:
+        """Returns all the origins where another area can be placed. The
+        origins are searched chunk by chunk in windows reaching as far as the
+        area past the chunk and returned in the row major order."""
+        n = self.tiles.chunk_size
+        found = []
+        for y in range(0, self.h, n):
+            for x in range(0, self.w, n):
+                size = (
+                    min(self.h - y, n + to_fit.h - 1),
+                    min(self.w - x, n + to_fit.w - 1),
+                )
+                origins = self.tiles.window(Point(y, x), size).fit_in(
+                    to_fit.tiles
+                )
+                inside = (origins[:, 0] < n) & (origins[:, 1] < n)
+                found.append(origins[inside] + (y, x))
+        origins = np.concatenate(found)
+        return origins[np.lexsort((origins[:, 1], origins[:, 0]))]
@@ -1,29 +1,90 @@
+from __future__ import annotations
+
 from typing import Tuple
 
+import numpy as np
+from numpy.typing import NDArray
+
 import tile_types
 from game_map.areas.area import Area
 from game_map.areas.rooms.rooms import Room
 from game_map.areas.simple_area import SimpleArea
+from game_map.areas.tiles.placement import PlacementIndex
+from game_map.areas.tiles.supplementaries import Point
 from utils.graph.graph import Graph
 
 
 class GameMap(Area):
     def __init__(self, size: Tuple):
+        self._placement_index = None
         super().__init__(size)
         self.fill(tile_types.wall)
         self.room_graph = Graph()
 
+    @property
+    def placement_index(self) -> PlacementIndex:
+        """An index of the placeable tiles. It is built on the first query and
+        patched locally whenever a placement makes tiles unplaceable."""
+        if self._placement_index is None:
+            self._placement_index = self.tiles.placement_index()
+        return self._placement_index
+
+    def invalidate(self) -> None:
+        super().invalidate()
+        self._placement_index = None
+
+    def __getstate__(self):
+        # The placement index is rebuilt from the tiles on the first query.
+        state = self.__dict__.copy()
+        state["_placement_index"] = None
+        return state
+
+    def _placeable_changed(self, p: Point, before: NDArray[np.bool_]) -> None:
+        super()._placeable_changed(p, before)
+        if self._placement_index is not None:
+            after = self.tiles.placable[
+                p.y : p.y + before.shape[0], p.x : p.x + before.shape[1]
+            ]
+            self._placement_index.add(
+                p.y, p.x, before.astype(np.int8) - after.astype(np.int8)
+            )
+
+    def save(self, path: str) -> None:
+        """Saves the map into a binary file which can be memory mapped."""
+        from game_map.areas import map_file
+
+        map_file.save(self, path)
+
+    @staticmethod
+    def load(path: str, mmap: bool = True) -> GameMap:
+        """Loads a map saved by save. With mmap, the tiles are shared with the
+        file until they are written to."""
+        from game_map.areas import map_file
+
+        return map_file.load(path, mmap)
+
+    def is_placable(self, area: SimpleArea) -> bool:
+        return self.placement_index.is_placable(
+            area.origin.y, area.origin.x, area.tiles.mask
+        )
+
     def place_room(self, room: Room) -> None:
         super().place_in(room)
         self.room_graph.push(room)
 
-    def place_room_next_to(self, to_place: Room, neighbour: Room) -> bool:
-        placed = self.place_in_randomly(
-            self.fit_next_to(to_place, neighbour), to_place
-        )
+    def place_room_next_to(
+        self,
+        to_place: Room,
+        neighbour: Room,
+        candidates: NDArray[np.int32] = None,
+    ) -> bool:
+        """Places the room at a random origin next to the neighbour. The
+        origins found by fit_next_to can be given to skip the search."""
+        if candidates is None:
+            candidates = self.fit_next_to(to_place, neighbour)
+        placed = self.place_in_randomly(candidates, to_place)
         if placed:
-            self.room_graph.push(to_place, [neighbour])
-            self.room_graph.add_neighbour_to(neighbour, to_place)
+            self.room_graph.add_edge(to_place, neighbour)
         return placed
 
     def make_entrance_between(self, first: Room, second: Room) -> None:
@@ -0,0 +1,248 @@
+"""Binary map format which can be opened as a memory map.
+
+The file starts with a magic string and the length of a JSON header. The
+header describes the tile types, the palette of the tile types, the tree of
+the areas with their origins and the room graph. The tile arrays of the areas
+follow, each one aligned and in C order, so a single field can be read
+without loading the whole file."""
+
+from __future__ import annotations
+
+import json
+from copy import copy
+from typing import Dict, List, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+import tile_types
+from game_map.areas.area import Area
+from game_map.areas.game_map import GameMap
+from game_map.areas.rooms.rooms import LRoom, Room
+from game_map.areas.simple_area import SimpleArea
+from game_map.areas.tiles.supplementaries import Point, Rectangle
+from game_map.areas.tiles.tiles import Tiles
+
+MAGIC = b"HAMINGJA"
+VERSION = 2
+ALIGNMENT = 64
+HEADER_LENGTH_SIZE = 8
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _descr(dtype: np.dtype) -> list:
+    """Returns the description of a type as stored in the header."""
+    return json.loads(json.dumps(dtype.descr))
+
+
+def _qualified_name(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+# The area types which can be saved, by the names stored in the header. A
+# name read from a file is only looked up, nothing is imported.
+AREA_TYPES = {
+    _qualified_name(cls): cls
+    for cls in (SimpleArea, Area, GameMap, Room, LRoom)
+}
+
+
+def _class_name(area: SimpleArea) -> str:
+    name = _qualified_name(type(area))
+    if AREA_TYPES.get(name) is not type(area):
+        raise ValueError(f"Area type {name} cannot be saved.")
+    return name
+
+
+def _area_class(name: str) -> type:
+    cls = AREA_TYPES.get(name)
+    if cls is None:
+        raise ValueError(f"Unknown area type {name}.")
+    return cls
+
+
+def _walk(area: SimpleArea, parent: int, areas: List) -> None:
+    """Lists the areas of the tree depth first with the index of the parent."""
+    areas.append((area, parent))
+    index = len(areas) - 1
+    for child in getattr(area, "children", ()):
+        _walk(child, index, areas)
+
+
+def _drawn(area: SimpleArea) -> Tiles:
+    """Returns a copy of the tiles of the area with the tile types of all its
+    children drawn in. The mask and the placeable fields of the area are kept
+    and the area itself is left untouched."""
+    tiles = copy(area.tiles)
+    bbox = Rectangle(Point(0, 0), area.size)
+    for child in getattr(area, "children", ()):
+        overlap = bbox.intersection(Rectangle(child.origin, child.size))
+        if overlap.is_empty():
+            continue
+        tiles.draw(
+            overlap.origin,
+            _drawn(child).window(overlap.origin - child.origin, overlap.size),
+        )
+    return tiles
+
+
+def save(game_map: GameMap, path: str) -> None:
+    """Saves the map with all its areas and its room graph. The tiles of
+    every area are saved with the tile types of its children drawn in, the
+    map itself is not modified."""
+    areas = []
+    _walk(game_map, -1, areas)
+    indexes = {id(area): index for index, (area, _) in enumerate(areas)}
+    records = []
+    offset = 0
+    for area, parent in areas:
+        records.append(
+            {
+                "type": _class_name(area),
+                "parent": parent,
+                "origin": [int(area.origin.y), int(area.origin.x)],
+                "shape": list(area.size),
+                "offset": offset,
+            }
+        )
+        offset = _aligned(
+            offset + area.h * area.w * tile_types.cell_dt.itemsize
+        )
+    try:
+        graph = [
+            [
+                indexes[id(vertex.value)],
+                [indexes[id(neighbour)] for neighbour in vertex.neighbours],
+            ]
+            for vertex in game_map.room_graph.vertices
+        ]
+    except KeyError:
+        raise ValueError("Room graph contains a room outside the map.")
+    header = json.dumps(
+        {
+            "version": VERSION,
+            "dtype": _descr(tile_types.cell_dt),
+            "tile_dtype": _descr(tile_types.tile_dt),
+            "palette": tile_types.PALETTE.records.tobytes().hex(),
+            "areas": records,
+            "graph": graph,
+        }
+    ).encode()
+    data_offset = _aligned(len(MAGIC) + HEADER_LENGTH_SIZE + len(header))
+    header += b" " * (
+        data_offset - len(MAGIC) - HEADER_LENGTH_SIZE - len(header)
+    )
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(HEADER_LENGTH_SIZE, "little"))
+        f.write(header)
+        for (area, _), record in zip(areas, records):
+            f.seek(data_offset + record["offset"])
+            f.write(np.ascontiguousarray(_drawn(area)._merged()).tobytes())
+        f.truncate(data_offset + offset)
+
+
+def read_header(path: str) -> Tuple[Dict, int]:
+    """Returns the header of a map file and the offset of the tile arrays."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Not a map file.")
+        length = int.from_bytes(f.read(HEADER_LENGTH_SIZE), "little")
+        header = json.loads(f.read(length))
+    if (
+        header["version"] != VERSION
+        or header["dtype"] != _descr(tile_types.cell_dt)
+        or header["tile_dtype"] != _descr(tile_types.tile_dt)
+    ):
+        raise ValueError("Incompatible map file.")
+    return header, len(MAGIC) + HEADER_LENGTH_SIZE + length
+
+
+def _palette(header: Dict) -> NDArray:
+    """Returns the palette the tiles of the file were saved with."""
+    return np.frombuffer(
+        bytes.fromhex(header["palette"]), dtype=tile_types.tile_dt
+    )
+
+
+def _open_tiles(path: str, offset: int, record: Dict, mmap: bool) -> NDArray:
+    shape = tuple(record["shape"])
+    if shape[0] * shape[1] == 0:
+        return np.empty(shape, dtype=tile_types.cell_dt)
+    if mmap:
+        return np.memmap(
+            path,
+            dtype=tile_types.cell_dt,
+            mode="r",
+            offset=offset + record["offset"],
+            shape=shape,
+        ).view(np.ndarray)
+    return np.fromfile(
+        path,
+        dtype=tile_types.cell_dt,
+        count=shape[0] * shape[1],
+        offset=offset + record["offset"],
+    ).reshape(shape)
+
+
+def _restore(cls: type, record: Dict, tiles: Tiles) -> SimpleArea:
+    """Creates an area of the class around the tiles without running the
+    constructor of the class, which would generate new tiles."""
+    area = cls.__new__(cls)
+    origin = Point.from_tuple(record["origin"])
+    if issubclass(cls, GameMap):
+        GameMap.__init__(area, (0, 0))
+    elif issubclass(cls, Area):
+        Area.__init__(area, (0, 0), origin)
+    else:
+        SimpleArea.__init__(area, (0, 0), origin)
+    area.origin = origin
+    area.tiles = tiles
+    area.invalidate()
+    if isinstance(area, Area):
+        # The saved tiles already show the tile types of the children.
+        area.dirty = []
+    return area
+
+
+def load(path: str, mmap: bool = True) -> GameMap:
+    """Loads a map saved by save. With mmap, the tiles are memory mapped and
+    shared with the file, they are copied only when written to. The ids of
+    the tiles are translated if the palette differs from the current one."""
+    header, offset = read_header(path)
+    palette = _palette(header)
+    ids = tile_types.PALETTE.ids(palette)
+    translate = not np.array_equal(ids, np.arange(len(palette)))
+    areas = []
+    for record in header["areas"]:
+        cells = _open_tiles(path, offset, record, mmap)
+        if translate:
+            cells = cells.copy()
+            cells["id"] = ids[cells["id"]]
+        tiles = Tiles.from_array(cells, shared=mmap and not translate)
+        area = _restore(_area_class(record["type"]), record, tiles)
+        if record["parent"] >= 0:
+            areas[record["parent"]].children.append(area)
+        areas.append(area)
+    game_map = areas[0]
+    if not isinstance(game_map, GameMap):
+        raise ValueError("Map file does not contain a game map.")
+    for vertex, neighbours in header["graph"]:
+        game_map.room_graph.push(
+            areas[vertex], [areas[neighbour] for neighbour in neighbours]
+        )
+    return game_map
+
+
+def load_field(path: str, name: str) -> NDArray:
+    """Memory maps a single field of the tiles of the map, e.g. mask. The
+    fields of the tile types, e.g. walkable, are looked up in the palette of
+    the file."""
+    header, offset = read_header(path)
+    cells = _open_tiles(path, offset, header["areas"][0], True)
+    if name in tile_types.CELL_FIELDS:
+        return cells[name]
+    return _palette(header)[name][cells["id"]]
@@ -1,5 +1,9 @@
+from __future__ import annotations
+
 import random
-from typing import Tuple
+from collections import OrderedDict
+from copy import copy
+from typing import Callable, Hashable, Tuple
 
 import tile_types
 from game_map.areas.area import Area
@@ -7,14 +11,11 @@ from game_map.areas.prototype_areas.prototype_areas import (
     create_carpet,
     create_column,
 )
-from game_map.areas.random_simple_areas import (
-    DimensionRange,
-    random_rectangle_area,
-)
+from game_map.areas.random_simple_areas import DimensionRange
+from game_map.areas.simple_area import SimpleArea
 from game_map.areas.tiles.supplementaries import Point
 from game_map.direction.direction import Direction
 
-
 # def generate_multi_room(width: int, height: int, subroom_dim_range:
 #    DimensionRange):
 
@@ -42,6 +43,34 @@ def prototype_room(size: Tuple):
     return room
 
 
+class RoomPrototypes:
+    """Built rooms by everything their construction depends on. A room is
+    built once and then cloned, the clones share the tiles copy-on-write, so
+    a room discarded after failing to fit costs only the cloning."""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._rooms: OrderedDict[Hashable, Room] = OrderedDict()
+
+    def get(self, key: Hashable, build: Callable[[], Room]) -> Room:
+        """Returns a clone of the prototype of the key, which is built if
+        missing."""
+        prototype = self._rooms.get(key)
+        if prototype is None:
+            prototype = self._rooms[key] = build()
+            if len(self._rooms) > self.max_size:
+                self._rooms.popitem(last=False)
+        else:
+            self._rooms.move_to_end(key)
+        return prototype.clone()
+
+    def clear(self) -> None:
+        self._rooms.clear()
+
+
+ROOM_PROTOTYPES = RoomPrototypes()
+
+
 class Room(Area):
     def __init__(self, size: Tuple):
         super().__init__(size)
@@ -57,6 +86,22 @@ class Room(Area):
         w = random.randrange(dim_range.min_h, dim_range.max_h + 1)
         return Room((h, w))
 
+    @classmethod
+    def from_prototype(cls, size: Tuple) -> Room:
+        """Returns the same room as the constructor cloned from a prototype."""
+        return ROOM_PROTOTYPES.get((cls, tuple(size)), lambda: cls(size))
+
+    def clone(self) -> Room:
+        """Returns a copy of the room at the origin sharing the tiles
+        copy-on-write. The children are not copied."""
+        room = type(self).__new__(type(self))
+        Area.__init__(room, (0, 0))
+        room.tiles = copy(self.tiles)
+        room.mark_dirty()
+        room._volume = self._volume
+        room._placeable_count = self._placeable_count
+        return room
+
     def make_entrance(self, position: Point) -> None:
         entrance = Area((1, 1), position)
         self.place_in(entrance)
@@ -83,19 +128,20 @@ class Room(Area):
 
 
 class LRoom(Room):
-    def __init__(self, size: Tuple, direction: Direction = None):
+    def __init__(
+        self,
+        size: Tuple,
+        direction: Direction = None,
+        cut_out_size: Tuple = None,
+    ):
         if direction is None:
             direction = Direction.get_random_direction()
+        if cut_out_size is None:
+            cut_out_size = LRoom.cut_out_range(size).sample()
         super().__init__(size)
-        fill_dim_range = DimensionRange(
-            self.h // 2.5,
-            self.h // 1.5,
-            self.w // 2.5,
-            self.w // 1.5,
-        )
-        rectangle = random_rectangle_area(fill_dim_range)
+        rectangle = SimpleArea(cut_out_size)
         p = self.fit_in_corner(rectangle, (direction,))[0]
-        rectangle.origin = p
+        rectangle.origin = Point.from_tuple(p)
         self.fill_out(rectangle)
         if __debug__:
             self.fill_border(tile_types.border_debug)
@@ -103,6 +149,28 @@ class LRoom(Room):
             self.fill_border(tile_types.wall)
         self.set_unplaceable(self.inner_border())
 
+    @staticmethod
+    def cut_out_range(size: Tuple) -> DimensionRange:
+        """Returns the range of the rectangle cut out of the corner."""
+        return DimensionRange(
+            size[0] // 2.5,
+            size[0] // 1.5,
+            size[1] // 2.5,
+            size[1] // 1.5,
+        )
+
+    @classmethod
+    def from_prototype(cls, size: Tuple, direction: Direction = None) -> LRoom:
+        """Returns the same room as the constructor cloned from a prototype.
+        The direction and the cut out are sampled in the same order."""
+        if direction is None:
+            direction = Direction.get_random_direction()
+        cut_out_size = LRoom.cut_out_range(size).sample()
+        return ROOM_PROTOTYPES.get(
+            (cls, tuple(size), direction, cut_out_size),
+            lambda: cls(size, direction, cut_out_size),
+        )
+
 
 # class MultiRectangleRoom(Room):
 #     def __init__(self, h: int, w: int):
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import random
-from copy import deepcopy
-from typing import Tuple, List
+from copy import copy
+from typing import Tuple
 
 import numpy as np
+from numpy.typing import NDArray
 
+from game_map.areas.tiles.placement import PlacementIndex
 from game_map.areas.tiles.supplementaries import Point
 from game_map.areas.tiles.tiles import Tiles
 from game_map.direction.direction import Direction
@@ -15,10 +17,15 @@ class SimpleArea:
     def __init__(self, size: Tuple, origin: Point = Point(0, 0)):
         self.origin = origin
         self.tiles = Tiles(size)
+        # Running counts of the mask and the placeable tiles, None if unknown.
+        self._volume = None
+        self._placeable_count = None
+        # Increased whenever the tiles may have changed.
+        self.version = 0
 
     @staticmethod
     def create_from_tiles(in_tiles: Tiles) -> SimpleArea:
-        result = SimpleArea(in_tiles.size)
+        result = SimpleArea((0, 0))
         result.tiles = in_tiles
         return result
 
@@ -42,27 +49,101 @@ class SimpleArea:
     def w(self):
         return self.tiles.w
 
+    @property
+    def placement_index(self) -> PlacementIndex | None:
+        """An index of the placeable tiles kept up to date by the area. None if
+        the area does not keep one and fit queries build their own."""
+        return None
+
+    def invalidate(self) -> None:
+        """Drops everything derived from the tiles. Called whenever the tiles
+        change in a way that is not tracked incrementally."""
+        self._volume = None
+        self._placeable_count = None
+        self.version += 1
+
+    def _placeable_window(self, area: SimpleArea) -> NDArray[np.bool_]:
+        """Returns a copy of the placeable tiles under the given area."""
+        p = area.origin
+        return self.tiles.placable[
+            p.y : p.y + area.h, p.x : p.x + area.w
+        ].copy()
+
+    def _placeable_changed(self, p: Point, before: NDArray[np.bool_]) -> None:
+        """Updates everything derived from the placeable tiles after they
+        changed inside the window at the given position."""
+        if self._placeable_count is not None:
+            after = self.tiles.placable[
+                p.y : p.y + before.shape[0], p.x : p.x + before.shape[1]
+            ]
+            self._placeable_count += np.count_nonzero(after) - np.count_nonzero(
+                before
+            )
+
+    def _counts_at(self, index) -> Tuple[int, int]:
+        """Returns the numbers of the mask and the placeable tiles at the
+        index."""
+        return (
+            np.count_nonzero(self.tiles.mask[index]),
+            np.count_nonzero(self.tiles.placable[index]),
+        )
+
+    def _invalidate_counted(self, index, before: Tuple[int, int]) -> None:
+        """Invalidates the area after the tiles at the index changed. The
+        running counts are updated by the change instead of being dropped."""
+        volume, placeable_count = self._volume, self._placeable_count
+        after = self._counts_at(index)
+        self.invalidate()
+        if volume is not None:
+            self._volume = volume + after[0] - before[0]
+        if placeable_count is not None:
+            self._placeable_count = placeable_count + after[1] - before[1]
+
     def fill(self, fill_value) -> None:
         """Fills the tiles with a value through the whole bounding box."""
         self.tiles.fill(fill_value)
+        self.invalidate()
 
     def fill_border(self, fill_value) -> None:
         """Sets border the border to have specific value."""
-        border_mask = self.tiles.inner_border().mask
-        self.tiles.tiles[border_mask] = fill_value
+        border = self.tiles.inner_border_mask()
+        before = self._counts_at(border)
+        self.tiles.tiles[border] = fill_value
+        self._invalidate_counted(border, before)
 
     def fill_in(self, area: SimpleArea) -> None:
         """Fills the tiles with a value in the given area."""
+        p = area.origin
+        window = (slice(p.y, p.y + area.h), slice(p.x, p.x + area.w))
+        before = self._counts_at(window)
         self.tiles.merge(area.origin, area.tiles)
+        self._invalidate_counted(window, before)
+
+    def set_mask(self, mask: NDArray[np.bool_]) -> None:
+        """Replaces the mask, the tiles outside the new mask become
+        unplaceable."""
+        self.tiles.mask = mask
+        self.invalidate()
+        # The whole mask was written, counting it costs no more than that.
+        self._volume, self._placeable_count = self._counts_at(...)
 
     def fill_out(self, area: SimpleArea) -> None:
         """Sets the tiles to not belongs to the object."""
+        p = area.origin
+        if self._volume is not None:
+            self._volume -= np.count_nonzero(
+                self.tiles.mask[p.y : p.y + area.h, p.x : p.x + area.w]
+                & area.tiles.mask
+            )
+        before = self._placeable_window(area)
         self.tiles.subtract_mask(area.origin, area.tiles)
+        self._placeable_changed(area.origin, before)
 
     def filled_out(self, area: SimpleArea) -> SimpleArea:
         """Returns an area which is missing the tiles of the given area from its
         mask."""
-        filled_out = deepcopy(self)
+        filled_out = SimpleArea.create_from_tiles(copy(self.tiles))
+        filled_out.origin = self.origin
         filled_out.fill_out(area)
         return filled_out
 
@@ -73,11 +154,13 @@ class SimpleArea:
         stretched_tiles.merge(self.origin, self.tiles)
         self.origin = Point(0, 0)
         self.tiles = stretched_tiles
+        self.invalidate()
 
     def stretched(self, size: Tuple) -> SimpleArea:
         """Returns the set as if it was inside a set of certain size at the
         origin position."""
-        stretched = deepcopy(self)
+        stretched = SimpleArea.create_from_tiles(self.tiles)
+        stretched.origin = self.origin
         stretched.stretch(size)
         return stretched
 
@@ -86,7 +169,9 @@ class SimpleArea:
         return SimpleArea.create_from_tiles(self.tiles.inner_border())
 
     def set_unplaceable(self, area: SimpleArea):
+        before = self._placeable_window(area)
         self.tiles.set_unplaceable(area.origin, area.tiles)
+        self._placeable_changed(area.origin, before)
 
     def is_inside(self, p: Point) -> bool:
         """Checks if the point is inside the bounding box."""
@@ -94,13 +179,20 @@ class SimpleArea:
 
     def volume(self) -> int:
         """Returns the number of pixels of the mask."""
-        return np.count_nonzero(self.tiles.mask)
+        if self._volume is None:
+            self._volume = np.count_nonzero(self.tiles.mask)
+        return self._volume
+
+    def placeable_count(self) -> int:
+        """Returns the number of placeable tiles."""
+        if self._placeable_count is None:
+            self._placeable_count = np.count_nonzero(self.tiles.placable)
+        return self._placeable_count
 
     def density(self) -> float:
         """Returns the ratio of placable tiles to all the tiles."""
-        return (
-            self.volume() - np.count_nonzero(self.tiles.placable)
-        ) / self.volume()
+        volume = self.volume()
+        return (volume - self.placeable_count()) / volume
 
     def uncover(self):
         return self.filled_out(self.inner_border())
@@ -110,19 +202,23 @@ class SimpleArea:
         local_point = Point(*random.choice(points))
         return local_point + self.origin
 
-    def fit_in(self, to_fit: SimpleArea) -> List[Point]:
-        return self.tiles.fit_in(to_fit.tiles)
+    def fit_in(self, to_fit: SimpleArea) -> NDArray[np.int32]:
+        """Returns all the origins where another area can be placed."""
+        return self.tiles.fit_in(to_fit.tiles, self.placement_index)
 
     def fit_in_direction(
         self,
         to_fit: SimpleArea,
         anchor: SimpleArea,
         directions: Tuple = Direction.get_all_directions(),
-    ) -> List[Point]:
+    ) -> NDArray[np.int32]:
         """Fits in another area on the points specified by the anchor in
         specific direction."""
         return self.tiles.fit_in_direction(
-            to_fit.tiles, anchor.stretched(self.size).tiles, directions
+            to_fit.tiles,
+            anchor.stretched(self.size).tiles,
+            directions,
+            self.placement_index,
         )
 
     def fit_in_touching(
@@ -131,11 +227,15 @@ class SimpleArea:
         anchor: SimpleArea,
         direction: Direction,
         offset: int = 0,
-    ) -> List[Point]:
+    ) -> NDArray[np.int32]:
         """Fits in another area touching the anchor in the given direction. The
         new tiles will not collide with the anchor."""
         return self.tiles.fit_in_touching(
-            to_fit.tiles, anchor.stretched().tiles, direction, offset
+            to_fit.tiles,
+            anchor.stretched(self.size).tiles,
+            direction,
+            offset,
+            self.placement_index,
         )
 
     def fit_in_touching_border(
@@ -143,26 +243,35 @@ class SimpleArea:
         to_fit: SimpleArea,
         direction: Direction,
         border_offset: int = 0,
-    ) -> List[Point]:
+    ) -> NDArray[np.int32]:
         """Fits in another area touching the inner border with"""
         return self.tiles.fit_in_touching(
-            to_fit.tiles, self.tiles.inner_border(), direction, border_offset
+            to_fit.tiles,
+            self.tiles.inner_border(),
+            direction,
+            border_offset,
+            self.placement_index,
         )
 
     def fit_in_corner(
         self,
         to_fit: SimpleArea,
         directions: Tuple = Direction.get_all_directions(),
-    ) -> List[Point]:
+    ) -> NDArray[np.int32]:
         """Places an areas in the corner. The areas will be touching the wall
         in defined direction and the next wall clockwise of that direction.
         For example: if direction is NORTH then the areas will be touching
         NORTH and EAST walls."""
-        result = []
-        for direction in directions:
-            result += self.tiles.fit_in_direction(
-                to_fit.tiles,
-                self.tiles.corners(direction),
-                (direction.get_opposite(),),
-            )
-        return result
+        if not directions:
+            return np.empty((0, 2), dtype=np.intp)
+        return np.concatenate(
+            [
+                self.tiles.fit_in_direction(
+                    to_fit.tiles,
+                    self.tiles.corners(direction),
+                    (direction.get_opposite(),),
+                    self.placement_index,
+                )
+                for direction in directions
+            ]
+        )
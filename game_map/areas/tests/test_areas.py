@@ -0,0 +1,130 @@
+import random
+import unittest
+
+import numpy as np
+
+import tile_types
+
+from game_map import GameMap
+from game_map.areas.rooms.rooms import Room
+from game_map.areas.simple_area import SimpleArea
+from game_map.areas.tiles.supplementaries import Point, Rectangle
+from game_map.direction.direction import Direction
+from game_map.map_generators.iterable_generators.room_neighbours_generator import (
+    RoomNeighboursGenerator,
+)
+from utils.utils import to_tuples
+
+
+class TestCounters(unittest.TestCase):
+    def assert_counters(self, area: SimpleArea):
+        self.assertEqual(area.volume(), np.count_nonzero(area.tiles.mask))
+        self.assertEqual(
+            area.placeable_count(), np.count_nonzero(area.tiles.placable)
+        )
+
+    def test_place_in(self):
+        game_map = GameMap((30, 30))
+        game_map.density()
+        room = Room((6, 8))
+        room.origin = Point(3, 4)
+        game_map.place_in(room)
+        self.assert_counters(game_map)
+        self.assertEqual(game_map.density(), 24 / 900)
+
+    def test_fill_out(self):
+        game_map = GameMap((30, 30))
+        game_map.density()
+        game_map.fit_in(Room((4, 4)))
+        hole = SimpleArea((5, 5), Point(25, 25))
+        game_map.fill_out(hole)
+        self.assert_counters(game_map)
+        np.testing.assert_array_equal(
+            game_map.placement_index.sat,
+            game_map.tiles.placement_index().sat,
+        )
+
+    def test_fill_in_and_border(self):
+        room = Room((8, 10))
+        room.density()
+        hole = SimpleArea((3, 3), Point(2, 2))
+        hole.tiles.placable[1, 1] = False
+        room.fill_out(hole)
+        room.fill_border(tile_types.red)
+        patch = SimpleArea((4, 4), Point(1, 1))
+        patch.tiles.placable[0, :] = False
+        room.fill_in(patch)
+        self.assertIsNotNone(room._volume)
+        self.assertIsNotNone(room._placeable_count)
+        self.assert_counters(room)
+
+    def test_set_mask(self):
+        game_map = GameMap((10, 12))
+        game_map.density()
+        mask = np.ones((10, 12), dtype=bool)
+        mask[:3, :4] = False
+        game_map.set_mask(mask)
+        self.assertIsNotNone(game_map._volume)
+        self.assert_counters(game_map)
+        self.assertEqual(game_map.volume(), 108)
+        self.assertEqual(game_map.placeable_count(), 108)
+
+
+class TestFitNextTo(unittest.TestCase):
+    def test_does_not_change_area(self):
+        game_map = GameMap((40, 40))
+        neighbour = Room((8, 8))
+        neighbour.origin = Point(15, 15)
+        game_map.place_in(neighbour)
+        before = game_map.tiles.tiles.copy()
+        origins = game_map.fit_next_to(Room((5, 6)), neighbour, Direction.EAST)
+        np.testing.assert_array_equal(game_map.tiles.tiles, before)
+        self.assertEqual(to_tuples(origins), [(y, 22) for y in range(11, 23)])
+
+
+class TestFitInCorner(unittest.TestCase):
+    def test_no_directions(self):
+        room = Room((10, 10))
+        origins = room.fit_in_corner(SimpleArea((2, 2)), ())
+        self.assertEqual(origins.shape, (0, 2))
+        self.assertEqual(
+            origins.dtype, room.fit_in_corner(SimpleArea((2, 2))).dtype
+        )
+
+
+class TestDrawChildren(unittest.TestCase):
+    def test_incremental_matches_full(self):
+        game_map = GameMap((30, 30))
+        first = Room((8, 10))
+        first.origin = Point(2, 2)
+        second = Room((8, 10))
+        second.origin = Point(2, 11)
+        game_map.place_in(first)
+        game_map.place_in(second)
+        game_map.draw_children()
+        first.fill_border(tile_types.red)
+        second.make_entrance(Point(3, 9))
+        regions = game_map.draw_children()
+        self.assertEqual(
+            regions,
+            [Rectangle(Point(2, 2), (8, 10)), Rectangle(Point(5, 20), (1, 1))],
+        )
+        incremental = game_map.tiles.tiles.copy()
+        for area in (game_map, first, second):
+            area.mark_dirty()
+        game_map.draw_children()
+        np.testing.assert_array_equal(game_map.tiles.tiles, incremental)
+        self.assertEqual(game_map.draw_children(), [])
+
+
+class TestRoomGraph(unittest.TestCase):
+    def test_generated_graph(self):
+        random.seed(4)
+        game_map = GameMap((50, 50))
+        RoomNeighboursGenerator(game_map, (0.1, 0.3), 0.4).generate()
+        graph = game_map.room_graph
+        self.assertEqual(set(graph), set(game_map.children))
+        self.assertEqual(len(graph.connected_components()), 1)
+        for room in graph:
+            for neighbour in graph.get_neighbours(room):
+                self.assertTrue(graph.has_edge(neighbour, room))
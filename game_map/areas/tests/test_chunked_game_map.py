@@ -0,0 +1,99 @@
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+import tile_types
+from game_map import GameMap
+from game_map.areas.chunked_game_map import ChunkedGameMap
+from game_map.areas.rooms.rooms import Room
+from game_map.areas.tiles.chunked_tiles import ChunkedTiles
+from game_map.areas.tiles.supplementaries import Point
+from game_map.areas.tiles.tiles import Tiles
+from game_map.map_generators.iterable_generators.room_neighbours_generator import (
+    RoomNeighboursGenerator,
+)
+
+
+class TestChunkedTiles(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "tiles.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_across_chunks(self):
+        chunked = ChunkedTiles((20, 30), self.path, 8, max_resident=2)
+        tiles = Tiles((20, 30), fill_value=tile_types.wall)
+        room = Tiles((6, 9), fill_value=tile_types.floor)
+        room.mask[0, 0] = False
+        for p in (Point(5, 5), Point(14, 20), Point(0, 1)):
+            chunked.merge(p, room)
+            tiles.merge(p, room)
+        chunked.set_unplaceable(Point(3, 10), room)
+        tiles.set_unplaceable(Point(3, 10), room)
+        chunked.flush()
+        np.testing.assert_array_equal(
+            np.asarray(chunked.window(Point(0, 0), (20, 30)).tiles),
+            np.asarray(tiles.tiles),
+        )
+        self.assertTrue(chunked.walkable_at(Point(8, 8)))
+        self.assertFalse(chunked.walkable_at(Point(0, 29)))
+        self.assertEqual(
+            chunked.count("placeable"), np.count_nonzero(tiles.placable)
+        )
+        for p in (Point(0, 0), Point(1, 20), Point(15, 24)):
+            self.assertEqual(
+                chunked.is_placable(p, room), tiles.is_placable(p, room)
+            )
+
+    def test_packed_storage(self):
+        chunked = ChunkedTiles((100, 130), self.path, 64, max_resident=1)
+        # Six chunks of ids and of the two fields packed into bits.
+        self.assertEqual(os.path.getsize(self.path), 6 * 64 * 64 * (1 + 2 / 8))
+        room = Tiles((70, 80), fill_value=tile_types.floor)
+        room.mask[0, :] = False
+        chunked.set_unplaceable(Point(20, 30), room)
+        chunked.subtract_mask(Point(20, 30), room)
+        chunked.flush()
+        self.assertEqual(chunked.count("mask"), 100 * 130 - 69 * 80)
+        self.assertEqual(chunked.count("placeable"), 100 * 130 - 69 * 80)
+        window = chunked.window(Point(19, 29), (3, 3))
+        np.testing.assert_array_equal(
+            window.mask, [[True] * 3, [True] * 3, [True, False, False]]
+        )
+
+    def test_generation_matches_game_map(self):
+        random.seed(5)
+        game_map = GameMap((50, 60))
+        RoomNeighboursGenerator(game_map, (0.1, 0.3), 0.5).generate()
+        game_map.draw_children()
+        random.seed(5)
+        chunked = ChunkedGameMap((50, 60), self.path, 16, max_resident=3)
+        RoomNeighboursGenerator(chunked, (0.1, 0.3), 0.5).generate()
+        chunked.draw_children()
+        self.assertEqual(len(chunked.children), len(game_map.children))
+        np.testing.assert_array_equal(
+            np.asarray(chunked.tiles.window(Point(0, 0), (50, 60)).tiles),
+            np.asarray(game_map.tiles.tiles),
+        )
+        self.assertEqual(chunked.density(), game_map.density())
+
+    def test_fit_in(self):
+        game_map = GameMap((40, 50))
+        chunked = ChunkedGameMap((40, 50), self.path, 16)
+        for area in (game_map, chunked):
+            room = Room((10, 12))
+            room.origin = Point(12, 14)
+            area.place_in(room)
+        room = Room((5, 7))
+        np.testing.assert_array_equal(
+            chunked.fit_in(room), game_map.fit_in(room)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+from copy import deepcopy
+from itertools import islice
+
+import numpy as np
+
+import tile_types
+from game_map import GameMap
+from game_map.areas import map_file
+from game_map.areas.rooms.rooms import Room
+from game_map.map_generators.iterable_generators.room_neighbours_generator import (
+    RoomNeighboursGenerator,
+)
+
+
+class TestMapFile(unittest.TestCase):
+    def setUp(self):
+        random.seed(3)
+        self.game_map = GameMap((40, 50))
+        RoomNeighboursGenerator(self.game_map, (0.1, 0.3), 0.3).generate()
+        first, second = self.game_map.room_graph.vertices[0].value, None
+        for neighbour in self.game_map.room_graph.get_neighbours(first):
+            second = neighbour
+        if second is not None:
+            self.game_map.make_entrance_between(first, second)
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "map.bin")
+        self.game_map.save(self.path)
+        self.drawn = deepcopy(self.game_map)
+        self.drawn.draw_children()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assert_same_tree(self, first, second, drawn):
+        """Checks the loaded area against the saved one, its tile types
+        against the saved one with the children drawn in."""
+        self.assertIs(type(first), type(second))
+        self.assertEqual(first.origin, second.origin)
+        np.testing.assert_array_equal(first.tiles.mask, second.tiles.mask)
+        np.testing.assert_array_equal(
+            first.tiles.placable, second.tiles.placable
+        )
+        np.testing.assert_array_equal(drawn.tiles.ids, second.tiles.ids)
+        first_children = getattr(first, "children", [])
+        second_children = getattr(second, "children", [])
+        self.assertEqual(len(first_children), len(second_children))
+        for children in zip(
+            first_children, second_children, getattr(drawn, "children", [])
+        ):
+            self.assert_same_tree(*children)
+
+    def test_round_trip(self):
+        for mmap in (True, False):
+            loaded = GameMap.load(self.path, mmap)
+            self.assert_same_tree(self.game_map, loaded, self.drawn)
+            self.assertEqual(loaded.draw_children(), [])
+            graph = [
+                (
+                    loaded.children.index(vertex.value),
+                    [loaded.children.index(n) for n in vertex.neighbours],
+                )
+                for vertex in loaded.room_graph.vertices
+            ]
+            expected = [
+                (
+                    self.game_map.children.index(vertex.value),
+                    [
+                        self.game_map.children.index(n)
+                        for n in vertex.neighbours
+                    ],
+                )
+                for vertex in self.game_map.room_graph.vertices
+            ]
+            self.assertEqual(graph, expected)
+
+    def test_copy_on_write(self):
+        loaded = GameMap.load(self.path)
+        room = Room((5, 5))
+        origins = loaded.fit_in(room)
+        self.assertTrue(loaded.place_in_randomly(origins, room))
+        loaded.draw_children()
+        reloaded = GameMap.load(self.path)
+        self.assert_same_tree(self.game_map, reloaded, self.drawn)
+
+    def test_placeable_kept(self):
+        loaded = GameMap.load(self.path)
+        self.assertEqual(loaded.density(), self.game_map.density())
+        room = self.game_map.children[0]
+        np.testing.assert_array_equal(
+            loaded.fit_in(room), self.game_map.fit_in(room)
+        )
+        room = Room((3, 3))
+        np.testing.assert_array_equal(
+            loaded.fit_in(room), self.game_map.fit_in(room)
+        )
+
+    def test_load_field(self):
+        walkable = map_file.load_field(self.path, "walkable")
+        np.testing.assert_array_equal(
+            walkable, self.drawn.tiles.tiles["walkable"]
+        )
+
+    def test_save_leaves_map_unchanged(self):
+        origins = []
+        for save in (False, True):
+            random.seed(5)
+            game_map = GameMap((50, 50))
+            placements = RoomNeighboursGenerator(
+                game_map, (0.1, 0.3), 0.5
+            ).iter_generate()
+            list(islice(placements, 3))
+            placable = game_map.tiles.placable.copy()
+            count = game_map.placeable_count()
+            if save:
+                game_map.save(self.path)
+            np.testing.assert_array_equal(game_map.tiles.placable, placable)
+            self.assertEqual(game_map.placeable_count(), count)
+            origins.append([placement.origin for placement in placements])
+        self.assertTrue(origins[0])
+        self.assertEqual(origins[0], origins[1])
+
+    def test_unknown_area_type(self):
+        header, offset = map_file.read_header(self.path)
+        header["areas"][1]["type"] = "subprocess.Popen"
+        data = json.dumps(header).encode()
+        length = offset - len(map_file.MAGIC) - map_file.HEADER_LENGTH_SIZE
+        data += b" " * (length - len(data))
+        with open(self.path, "r+b") as f:
+            f.seek(len(map_file.MAGIC))
+            f.write(len(data).to_bytes(map_file.HEADER_LENGTH_SIZE, "little"))
+            f.write(data)
+        with self.assertRaises(ValueError):
+            GameMap.load(self.path)
+
+    def test_not_a_map(self):
+        with open(self.path, "r+b") as f:
+            f.write(b"NOTAMAP!")
+        with self.assertRaises(ValueError):
+            GameMap.load(self.path)
@@ -0,0 +1,49 @@
+import random
+import unittest
+
+import numpy as np
+
+import tile_types
+from game_map.areas.rooms.rooms import ROOM_PROTOTYPES, LRoom, Room
+from game_map.areas.tiles.supplementaries import Point
+
+
+class TestRoomPrototypes(unittest.TestCase):
+    def setUp(self):
+        ROOM_PROTOTYPES.clear()
+
+    def assert_same_room(self, first, second):
+        self.assertIs(type(first), type(second))
+        np.testing.assert_array_equal(first.tiles.tiles, second.tiles.tiles)
+        self.assertEqual(first.volume(), second.volume())
+        self.assertEqual(first.placeable_count(), second.placeable_count())
+
+    def test_same_as_constructor(self):
+        for cls in (Room, LRoom, LRoom):
+            random.seed(7)
+            built = cls((12, 15))
+            expected_state = random.getstate()
+            for _ in range(2):
+                random.seed(7)
+                cloned = cls.from_prototype((12, 15))
+                self.assertEqual(random.getstate(), expected_state)
+                self.assert_same_room(cloned, built)
+
+    def test_clones_are_independent(self):
+        first = Room.from_prototype((8, 9))
+        second = Room.from_prototype((8, 9))
+        self.assertTrue(
+            np.shares_memory(first.tiles._tiles, second.tiles._tiles)
+        )
+        first.fill_border(tile_types.red)
+        first.origin = Point(3, 4)
+        first.make_entrance(Point(0, 2))
+        np.testing.assert_array_equal(
+            second.tiles.tiles, Room((8, 9)).tiles.tiles
+        )
+        self.assertEqual(second.origin, Point(0, 0))
+        self.assertEqual(second.children, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+"""Bit-packed masks.
+
+Every row of a mask is packed into 64 bit words, the bit i of the word j of a
+row is the column 64 * j + i. The padding bits past the last column are kept
+cleared, so the words can be combined and counted without unpacking."""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+WORD_BITS = 64
+
+# Number of set bits of every byte, used when numpy cannot count the bits.
+_BYTE_COUNTS = np.unpackbits(
+    np.arange(256, dtype=np.uint8)[:, None], axis=1
+).sum(axis=1)
+
+
+def _words(width: int) -> int:
+    return -(-width // WORD_BITS)
+
+
+class BitMask:
+    """A boolean mask stored in 64 bit words, eight times smaller than a
+    boolean array. The set operations, shifts and counts work on whole words.
+    """
+
+    def __init__(self, shape: Tuple[int, int], words: NDArray = None):
+        self.shape = (int(shape[0]), int(shape[1]))
+        if words is None:
+            words = np.zeros(
+                (self.shape[0], _words(self.shape[1])), dtype="<u8"
+            )
+        self.words = words
+
+    @staticmethod
+    def from_array(mask: NDArray[np.bool_]) -> BitMask:
+        mask = np.asarray(mask, dtype=np.bool_)
+        h, w = mask.shape
+        padded = np.zeros((h, _words(w) * WORD_BITS), dtype=np.bool_)
+        padded[:, :w] = mask
+        packed = np.packbits(padded, axis=1, bitorder="little")
+        return BitMask(mask.shape, packed.view("<u8"))
+
+    def to_array(self) -> NDArray[np.bool_]:
+        bits = np.unpackbits(
+            self.words.view(np.uint8), axis=1, bitorder="little"
+        )
+        return bits[:, : self.shape[1]].astype(np.bool_)
+
+    @property
+    def h(self) -> int:
+        return self.shape[0]
+
+    @property
+    def w(self) -> int:
+        return self.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return self.words.nbytes
+
+    def copy(self) -> BitMask:
+        return BitMask(self.shape, self.words.copy())
+
+    def _padding(self) -> np.uint64:
+        """Returns the bits of the last word of a row inside the mask."""
+        used = self.shape[1] % WORD_BITS
+        if used == 0:
+            return np.uint64(np.iinfo(np.uint64).max)
+        return np.uint64((1 << used) - 1)
+
+    def _check(self, other: BitMask) -> None:
+        if self.shape != other.shape:
+            raise ValueError("Operation with masks of different sizes.")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BitMask):
+            return NotImplemented
+        return self.shape == other.shape and np.array_equal(
+            self.words, other.words
+        )
+
+    def __and__(self, other: BitMask) -> BitMask:
+        self._check(other)
+        return BitMask(self.shape, self.words & other.words)
+
+    def __or__(self, other: BitMask) -> BitMask:
+        self._check(other)
+        return BitMask(self.shape, self.words | other.words)
+
+    def __xor__(self, other: BitMask) -> BitMask:
+        self._check(other)
+        return BitMask(self.shape, self.words ^ other.words)
+
+    def __sub__(self, other: BitMask) -> BitMask:
+        """Returns the difference of the masks."""
+        self._check(other)
+        return BitMask(self.shape, self.words & ~other.words)
+
+    def __iand__(self, other: BitMask) -> BitMask:
+        self._check(other)
+        self.words &= other.words
+        return self
+
+    def __ior__(self, other: BitMask) -> BitMask:
+        self._check(other)
+        self.words |= other.words
+        return self
+
+    def __ixor__(self, other: BitMask) -> BitMask:
+        self._check(other)
+        self.words ^= other.words
+        return self
+
+    def __isub__(self, other: BitMask) -> BitMask:
+        self._check(other)
+        self.words &= ~other.words
+        return self
+
+    def __invert__(self) -> BitMask:
+        words = ~self.words
+        if words.shape[1]:
+            words[:, -1] &= self._padding()
+        return BitMask(self.shape, words)
+
+    def count(self) -> int:
+        """Returns the number of set bits."""
+        bitwise_count = getattr(np, "bitwise_count", None)
+        if bitwise_count is not None:
+            return int(bitwise_count(self.words).sum())
+        return int(_BYTE_COUNTS[self.words.view(np.uint8)].sum())
+
+    def any(self) -> bool:
+        return bool(self.words.any())
+
+    def shifted(self, dy: int, dx: int) -> BitMask:
+        """Returns the mask moved by the offset. The bits moved past the
+        borders are lost and the vacated ones are cleared."""
+        h, w = self.shape
+        result = BitMask(self.shape)
+        if abs(dy) >= h or abs(dx) >= w:
+            return result
+        rows = self.words[max(0, -dy) : h - max(0, dy)]
+        shifted = np.zeros_like(rows)
+        # Whole words first, then the bits within the words with the carry
+        # from the neighbouring word.
+        skip, bits = divmod(abs(dx), WORD_BITS)
+        n = rows.shape[1]
+        if dx >= 0:
+            shifted[:, skip:] = rows[:, : n - skip]
+        else:
+            shifted[:, : n - skip] = rows[:, skip:]
+        if bits:
+            carry = np.zeros_like(shifted)
+            if dx >= 0:
+                carry[:, 1:] = shifted[:, :-1] >> np.uint64(WORD_BITS - bits)
+                shifted <<= np.uint64(bits)
+            else:
+                carry[:, :-1] = shifted[:, 1:] << np.uint64(WORD_BITS - bits)
+                shifted >>= np.uint64(bits)
+            shifted |= carry
+        if n:
+            shifted[:, -1] &= self._padding()
+        result.words[max(0, dy) : h - max(0, -dy)] = shifted
+        return result
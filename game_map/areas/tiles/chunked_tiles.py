@@ -0,0 +1,259 @@
+"""Tiles stored out of core in chunks."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Iterator, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+import tile_types
+from game_map.areas.tiles.bit_mask import BitMask, WORD_BITS
+from game_map.areas.tiles.supplementaries import Point, Rectangle
+from game_map.areas.tiles.tiles import Tiles
+
+# Chunk key, the slices of the piece in the chunk and in the window.
+Piece = Tuple[Tuple[int, int], Tuple[slice, slice], Tuple[slice, slice]]
+
+
+class ChunkedTiles:
+    """Tiles split into square chunks stored in a memory mapped file, chunk
+    after chunk, so a chunk is read and written as contiguous blocks. The
+    chunks are loaded on their first use and only the most recently used ones
+    stay in memory, the modified ones are written back when they are evicted.
+
+    The file holds the ids of the tile types of all the chunks followed by
+    the mask and the placeable fields packed into bits, so a tile takes a
+    byte and a quarter instead of three. The resident chunks are unpacked.
+
+    The file is working storage of the tiles, the ids of the tile types refer
+    to the current palette. Only windowed queries and updates are supported,
+    any window is assembled across the chunk boundaries."""
+
+    def __init__(
+        self,
+        size: Tuple[int, int],
+        path: str,
+        chunk_size: int = 256,
+        max_resident: int = 64,
+        fill_value=tile_types.wall,
+    ):
+        self._size = (int(size[0]), int(size[1]))
+        self.path = path
+        self.chunk_size = chunk_size
+        self.max_resident = max_resident
+        chunks = (
+            max(1, -(-self._size[0] // chunk_size)),
+            max(1, -(-self._size[1] // chunk_size)),
+        )
+        ids_size = chunks[0] * chunks[1] * chunk_size * chunk_size
+        words = -(-chunk_size // WORD_BITS)
+        bits_shape = chunks + (chunk_size, words)
+        bits_size = int(np.prod(bits_shape)) * 8
+        # The packed fields start at a word boundary after the ids.
+        bits_offset = -(-ids_size // 8) * 8
+        self._file = np.memmap(
+            path, dtype=np.uint8, mode="w+", shape=bits_offset + 2 * bits_size
+        )
+        self._ids = self._file[:ids_size].reshape(
+            chunks + (chunk_size, chunk_size)
+        )
+        self._bits = {
+            name: self._file[
+                bits_offset + i * bits_size : bits_offset + (i + 1) * bits_size
+            ]
+            .view("<u8")
+            .reshape(bits_shape)
+            for i, name in enumerate(tile_types.CELL_FIELDS)
+        }
+        self._resident: OrderedDict[Tuple[int, int], NDArray] = OrderedDict()
+        self._modified = set()
+        self.fill(fill_value)
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self._size
+
+    @property
+    def h(self) -> int:
+        return self._size[0]
+
+    @property
+    def w(self) -> int:
+        return self._size[1]
+
+    def point_in_bbox(self, p: Point) -> bool:
+        return 0 <= p.y < self.h and 0 <= p.x < self.w
+
+    def set_in_bbox(self, p: Point, tiles: Tiles) -> bool:
+        return self.point_in_bbox(p) and self.point_in_bbox(
+            Point(p.y + tiles.h - 1, p.x + tiles.w - 1)
+        )
+
+    def same_size(self, other) -> bool:
+        return self.size == other.size
+
+    def _read(self, key: Tuple[int, int]) -> NDArray:
+        """Returns the chunk unpacked from the file."""
+        n = self.chunk_size
+        chunk = np.empty((n, n), dtype=tile_types.cell_dt)
+        chunk["id"] = self._ids[key]
+        for name, bits in self._bits.items():
+            chunk[name] = BitMask((n, n), bits[key]).to_array()
+        return chunk
+
+    def _write(self, key: Tuple[int, int], chunk: NDArray) -> None:
+        """Packs the chunk into the file."""
+        self._ids[key] = chunk["id"]
+        for name, bits in self._bits.items():
+            bits[key] = BitMask.from_array(chunk[name]).words
+
+    def _chunk(self, key: Tuple[int, int], write: bool = False) -> NDArray:
+        """Returns the resident chunk, loading it and evicting the least
+        recently used one if needed."""
+        chunk = self._resident.get(key)
+        if chunk is None:
+            chunk = self._resident[key] = self._read(key)
+            if len(self._resident) > self.max_resident:
+                self._evict()
+        else:
+            self._resident.move_to_end(key)
+        if write:
+            self._modified.add(key)
+        return chunk
+
+    def _evict(self) -> None:
+        key, chunk = self._resident.popitem(last=False)
+        if key in self._modified:
+            self._modified.remove(key)
+            self._write(key, chunk)
+
+    def flush(self) -> None:
+        """Writes the modified chunks into the file."""
+        for key in self._modified:
+            self._write(key, self._resident[key])
+        self._modified.clear()
+        self._file.flush()
+
+    def _pieces(self, p: Point, size: Tuple[int, int]) -> Iterator[Piece]:
+        """Yields the pieces of the chunks covering the window clipped to the
+        bounding box."""
+        window = Rectangle(p, size).intersection(
+            Rectangle(Point(0, 0), self.size)
+        )
+        if window.is_empty():
+            return
+        n = self.chunk_size
+        for cy in range(window.origin.y // n, (window.end.y - 1) // n + 1):
+            for cx in range(window.origin.x // n, (window.end.x - 1) // n + 1):
+                piece = window.intersection(
+                    Rectangle(Point(cy * n, cx * n), (n, n))
+                )
+                yield (
+                    (cy, cx),
+                    piece.moved(Point(-cy * n, -cx * n)).slices(),
+                    piece.moved(Point(-p.y, -p.x)).slices(),
+                )
+
+    def fill(self, fill_value) -> None:
+        """Fills all the tiles with a value, the chunks are written directly
+        into the file."""
+        self._resident.clear()
+        self._modified.clear()
+        n = self.chunk_size
+        cells = np.full((n, n), tile_types.PALETTE.cells(fill_value))
+        self._ids[...] = cells["id"]
+        for name, bits in self._bits.items():
+            bits[...] = BitMask.from_array(cells[name]).words
+        self._file.flush()
+
+    def read(self, p: Point, size: Tuple[int, int]) -> NDArray:
+        """Returns a copy of the cells in the window."""
+        cells = np.zeros(size, dtype=tile_types.cell_dt)
+        for key, chunk_window, window in self._pieces(p, size):
+            cells[window] = self._chunk(key)[chunk_window]
+        return cells
+
+    def window(self, p: Point, size: Tuple[int, int]) -> Tiles:
+        """Returns a copy of the tiles in the window of the given size at the
+        given position. The window has to be inside the bounding box."""
+        return Tiles.from_array(self.read(p, size))
+
+    def _update(self, p: Point, other: Tiles, update) -> None:
+        """Calls the update with the tiles of every chunk under the other
+        tiles, their position in the chunk and the piece of the other."""
+        for key, chunk_window, window in self._pieces(p, other.size):
+            chunk = Tiles.from_array(self._chunk(key, write=True))
+            update(
+                chunk,
+                Point(chunk_window[0].start, chunk_window[1].start),
+                other.window(
+                    Point(window[0].start, window[1].start),
+                    (
+                        window[0].stop - window[0].start,
+                        window[1].stop - window[1].start,
+                    ),
+                ),
+            )
+
+    def merge(self, p: Point, other: Tiles) -> None:
+        """Performs a union of two tiles at the given position."""
+        self._update(p, other, Tiles.merge)
+
+    def subtract_mask(self, p: Point, other: Tiles) -> None:
+        """Subtracts two tiles at the given position."""
+        self._update(p, other, Tiles.subtract_mask)
+
+    def set_unplaceable(self, p: Point, other: Tiles) -> int:
+        """Makes the tiles under the mask of the other tiles unplaceable and
+        returns the number of the tiles which were placeable before."""
+        changed = 0
+
+        def update(chunk: Tiles, q: Point, piece: Tiles) -> None:
+            nonlocal changed
+            window = chunk.placable[q.y : q.y + piece.h, q.x : q.x + piece.w]
+            changed += np.count_nonzero(window & piece.mask)
+            chunk.set_unplaceable(q, piece)
+
+        self._update(p, other, update)
+        return changed
+
+    def is_placable(self, p: Point, other: Tiles) -> bool:
+        if not self.set_in_bbox(p, other):
+            return False
+        return self.window(p, other.size).is_placable(Point(0, 0), other)
+
+    def is_subset(self, p: Point, other: Tiles) -> bool:
+        if not self.set_in_bbox(p, other):
+            return False
+        return self.window(p, other.size).is_subset(Point(0, 0), other)
+
+    def collides(self, p: Point, other: Tiles) -> bool:
+        """Checks whether the other tiles at the position intersects the
+        mask."""
+        clipped, origin = other.clipped(p, self.size)
+        return self.window(origin, clipped.size).collides(Point(0, 0), clipped)
+
+    def walkable_at(self, p: Point) -> bool:
+        cells = self.read(p, (1, 1))
+        return bool(tile_types.PALETTE.table("walkable")[cells["id"][0, 0]])
+
+    def count(self, name: str) -> int:
+        """Returns the number of the tiles with the mask or placeable field
+        set, counted chunk by chunk without evicting the resident ones. The
+        bits of the chunks which are not resident are counted packed."""
+        count = 0
+        n = self.chunk_size
+        for key, (rows, columns), _ in self._pieces(Point(0, 0), self.size):
+            chunk = self._resident.get(key)
+            if chunk is not None:
+                count += int(np.count_nonzero(chunk[rows, columns][name]))
+                continue
+            inside = np.zeros((1, n), dtype=np.bool_)
+            inside[0, columns] = True
+            words = (
+                self._bits[name][key][rows] & BitMask.from_array(inside).words
+            )
+            count += BitMask((words.shape[0], n), words).count()
+        return count
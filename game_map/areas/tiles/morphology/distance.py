@@ -0,0 +1,123 @@
+"""Distance transforms of masks.
+
+Every tile of the mask gets the distance to the nearest tile outside the mask,
+the tiles outside the mask get zero. The tiles beyond the borders do not count
+as outside, so a mask without any background is infinitely far from it."""
+
+from enum import Enum
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Stands in for infinity in the parabolas of the Euclidean transform, which
+# would otherwise produce nan. It is far above any squared distance on a map.
+_FAR = 1e20
+
+
+class DistanceMetric(Enum):
+    CITY_BLOCK = "city_block"
+    CHESSBOARD = "chessboard"
+    EUCLIDEAN = "euclidean"
+
+
+def _row_distances(mask: NDArray[np.bool_]) -> NDArray[np.float64]:
+    """Returns the distance to the nearest background tile in the same row."""
+    indexes = np.broadcast_to(
+        np.arange(mask.shape[1], dtype=np.float64), mask.shape
+    )
+    previous = np.maximum.accumulate(np.where(mask, -np.inf, indexes), axis=1)
+    following = np.minimum.accumulate(
+        np.where(mask, np.inf, indexes)[:, ::-1], axis=1
+    )[:, ::-1]
+    return np.minimum(indexes - previous, following - indexes)
+
+
+def _city_block_columns(g: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Returns min over y' of |y - y'| + g[y'] for every column. The minimum
+    over y' <= y equals y + cummin(g[y'] - y'), and symmetrically from below."""
+    indexes = np.arange(g.shape[0], dtype=np.float64)[:, None]
+    from_above = indexes + np.minimum.accumulate(g - indexes, axis=0)
+    from_below = np.minimum.accumulate((g + indexes)[::-1], axis=0)[::-1]
+    return np.minimum(from_above, from_below - indexes)
+
+
+def _chessboard_columns(g: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Returns min over y' of max(|y - y'|, g[y']) for every column. A row is
+    relaxed by the row above it and its diagonal neighbours, then by the row
+    below it in the backward sweep."""
+    result = g.copy()
+    for rows in (range(1, g.shape[0]), range(g.shape[0] - 2, -1, -1)):
+        step = 1 if rows.step == 1 else -1
+        for y in rows:
+            previous = result[y - step]
+            nearest = previous.copy()
+            np.minimum(nearest[1:], previous[:-1], out=nearest[1:])
+            np.minimum(nearest[:-1], previous[1:], out=nearest[:-1])
+            np.minimum(result[y], nearest + 1, out=result[y])
+    return result
+
+
+def _squared_euclidean_columns(
+    g: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """Returns min over y' of (y - y')^2 + g[y']^2 for every column as the
+    lower envelope of parabolas by Felzenszwalb and Huttenlocher. The
+    envelopes of all the columns are built together row by row, a row is
+    pushed after popping the hidden parabolas of only the columns which still
+    have any. The envelopes are then read out for all the rows at once."""
+    n, m = g.shape
+    columns = np.arange(m)
+    f = np.where(np.isinf(g), _FAR, g**2)
+    lifted = (f + (np.arange(n, dtype=np.float64) ** 2)[:, None]).ravel()
+    # Rows of the parabolas in the envelopes and the boundaries between them,
+    # the k-th of a column at k * m + column.
+    vertices = np.zeros(n * m, dtype=np.intp)
+    boundaries = np.empty((n + 1) * m)
+    boundaries[:m] = -np.inf
+    boundaries[m : 2 * m] = np.inf
+    top = columns.copy()
+    for q in range(1, n):
+        row = lifted[q * m : (q + 1) * m]
+        v = vertices[top]
+        s = (row - lifted[v * m + columns]) / (2 * (q - v))
+        hidden = np.flatnonzero(s <= boundaries[top])
+        while hidden.size:
+            top[hidden] -= m
+            v = vertices[top[hidden]]
+            s[hidden] = (row[hidden] - lifted[v * m + hidden]) / (2 * (q - v))
+            hidden = hidden[s[hidden] <= boundaries[top[hidden]]]
+        top += m
+        vertices[top] = q
+        boundaries[top] = s
+        boundaries[top + m] = np.inf
+    # The parabola of a row is the number of the boundaries below the row, so
+    # every boundary is counted from the first row past it.
+    used = np.arange(1, n)[:, None] <= top // m
+    starts = np.where(used, boundaries[m : n * m].reshape(n - 1, m), n)
+    np.floor(starts, out=starts)
+    np.clip(starts, -1, n - 1, out=starts)
+    starts = (starts.astype(np.intp) + 1) * m + columns
+    counts = np.bincount(starts.ravel(), minlength=(n + 1) * m)[: n * m]
+    k = np.cumsum(counts.reshape(n, m), axis=0)
+    v = vertices[k * m + columns]
+    result = (np.arange(n)[:, None] - v) ** 2 + f.ravel()[v * m + columns]
+    result[result >= _FAR] = np.inf
+    return result
+
+
+def distance_transform(
+    mask: NDArray[np.bool_], metric: DistanceMetric = DistanceMetric.EUCLIDEAN
+) -> NDArray[np.float64]:
+    """Returns the distance of every tile of the mask to the nearest tile
+    outside the mask. The result is inf where there is no such tile."""
+    mask = np.asarray(mask, dtype=np.bool_)
+    if mask.size == 0:
+        return np.zeros(mask.shape)
+    g = _row_distances(mask)
+    if metric == DistanceMetric.CITY_BLOCK:
+        return _city_block_columns(g)
+    if metric == DistanceMetric.CHESSBOARD:
+        return _chessboard_columns(g)
+    if metric == DistanceMetric.EUCLIDEAN:
+        return np.sqrt(_squared_euclidean_columns(g))
+    raise ValueError("Invalid distance metric.")
@@ -1,26 +1,155 @@
+"""Morphological operations on boolean arrays. Every operation is computed
+with one whole-array operation per tile of the structural element. Tiles
+outside the array are padded with an explicit border value."""
+
+from typing import Iterator, List
+
 import numpy as np
+from numpy.typing import NDArray
+
+from game_map.areas.tiles.morphology.structural_element import (
+    StructuralElement,
+    THINNING_SES,
+)
+
+
+def shifted_windows(
+    in_tiles: NDArray[np.bool_],
+    offsets: NDArray[np.int32],
+    border_value: bool,
+) -> Iterator[NDArray[np.bool_]]:
+    """Yields an array for every offset whose value at i is the input at
+    i + offset. Tiles outside the input are given the border value."""
+    if len(offsets) == 0:
+        return
+    h, w = in_tiles.shape
+    before = np.maximum(0, -offsets.min(axis=0))
+    after = np.maximum(0, offsets.max(axis=0))
+    padded = np.pad(
+        in_tiles,
+        ((before[0], after[0]), (before[1], after[1])),
+        constant_values=border_value,
+    )
+    for dy, dx in offsets + before:
+        yield padded[dy : dy + h, dx : dx + w]
+
 
-from game_map.areas.tiles.morphology.structural_element import StructuralElement
-from game_map.areas.tiles.supplementaries import Point
-from utils.utils import subtract_tuples
+def shifted(
+    in_tiles: NDArray[np.bool_],
+    offset: NDArray[np.int32],
+    border_value: bool = False,
+) -> NDArray[np.bool_]:
+    """Returns the input moved by the offset. Tiles moved in from outside are
+    given the border value."""
+    return next(
+        shifted_windows(in_tiles, -np.reshape(offset, (1, 2)), border_value)
+    )
 
 
-def hit_or_miss(in_tiles, se: StructuralElement):
-    """Hit or Miss morphological operation with the given structural element."""
-    if not se.tiles.point_in_bbox(se.origin):
-        raise ValueError(
-            "The function does not support the origin outside the "
-            "structuring element."
-        )
+def _all_at(
+    in_tiles: NDArray[np.bool_],
+    offsets: NDArray[np.int32],
+    border_value: bool,
+) -> NDArray[np.bool_]:
+    result = np.full(in_tiles.shape, fill_value=True)
+    for window in shifted_windows(in_tiles, offsets, border_value):
+        result &= window
+    return result
+
+
+def _any_at(
+    in_tiles: NDArray[np.bool_],
+    offsets: NDArray[np.int32],
+    border_value: bool,
+) -> NDArray[np.bool_]:
     result = np.full(in_tiles.shape, fill_value=False)
-    for i in np.ndindex(in_tiles.shape):
-        o = subtract_tuples(i, (se.origin.y, se.origin.x))
-        cutout = in_tiles[
-            max(0, o[0]) : o[0] + se.h,
-            max(0, o[1]) : o[1] + se.w,
-        ]
-        result[i] = np.all(
-            cutout
-            == se.tiles.clipped(Point(o[0], o[1]), in_tiles.shape)[0].mask
-        )
+    for window in shifted_windows(in_tiles, offsets, border_value):
+        result |= window
+    return result
+
+
+def erode(
+    in_tiles: NDArray[np.bool_],
+    se: StructuralElement,
+    border_value: bool = False,
+) -> NDArray[np.bool_]:
+    """Erosion with the given structural element. By default the tiles outside
+    the array are background."""
+    return _all_at(
+        np.asarray(in_tiles, dtype=np.bool_), se.hit_offsets(), border_value
+    )
+
+
+def dilate(
+    in_tiles: NDArray[np.bool_],
+    se: StructuralElement,
+    border_value: bool = False,
+) -> NDArray[np.bool_]:
+    """Dilation with the given structural element. By default the tiles outside
+    the array are background."""
+    return _any_at(
+        np.asarray(in_tiles, dtype=np.bool_), -se.hit_offsets(), border_value
+    )
+
+
+def opening(
+    in_tiles: NDArray[np.bool_],
+    se: StructuralElement,
+    border_value: bool = False,
+) -> NDArray[np.bool_]:
+    """Erosion followed by dilation with the given structural element."""
+    return dilate(erode(in_tiles, se, border_value), se, border_value)
+
+
+def closing(
+    in_tiles: NDArray[np.bool_],
+    se: StructuralElement,
+    border_value: bool = False,
+) -> NDArray[np.bool_]:
+    """Dilation followed by erosion with the given structural element."""
+    return erode(dilate(in_tiles, se, border_value), se, border_value)
+
+
+def hit_or_miss(
+    in_tiles: NDArray[np.bool_],
+    se: StructuralElement,
+    border_value: bool = None,
+) -> NDArray[np.bool_]:
+    """Hit or Miss morphological operation with the given structural element.
+    If the border value is None, the tiles outside the array match both the
+    hits and the misses."""
+    in_tiles = np.asarray(in_tiles, dtype=np.bool_)
+    hits = _all_at(
+        in_tiles,
+        se.hit_offsets(),
+        True if border_value is None else border_value,
+    )
+    misses = _all_at(
+        ~in_tiles,
+        se.miss_offsets(),
+        True if border_value is None else not border_value,
+    )
+    return hits & misses
+
+
+def thinning(
+    in_tiles: NDArray[np.bool_],
+    ses: List[StructuralElement] = None,
+    border_value: bool = False,
+    max_iterations: int = None,
+) -> NDArray[np.bool_]:
+    """Thins the input by removing hit or miss matches of the structural
+    elements in sequence until nothing changes. By default the Golay elements
+    are used which thin the input to its skeleton."""
+    if ses is None:
+        ses = THINNING_SES
+    result = np.asarray(in_tiles, dtype=np.bool_).copy()
+    iteration = 0
+    while max_iterations is None or iteration < max_iterations:
+        previous = result.copy()
+        for se in ses:
+            result &= ~hit_or_miss(result, se, border_value)
+        if np.array_equal(previous, result):
+            break
+        iteration += 1
     return result
@@ -1,16 +1,34 @@
+from __future__ import annotations
+
 import numpy as np
 from numpy.typing import NDArray
 
 from game_map.areas.tiles.supplementaries import Point
 from game_map.areas.tiles.tiles import Tiles
+from game_map.direction.connectivity import Connectivity
 from game_map.direction.direction import Direction
 
 
 class StructuralElement:
-    def __init__(self, mask: NDArray[np.int32], origin: Point):
+    """A structural element of a morphological operation. Its mask defines the
+    hits, i.e. the tiles which have to be in the foreground, and the miss mask
+    defines the tiles which have to be in the background. Tiles in neither of
+    them are ignored. By default every tile outside the mask is a miss. The
+    origin can be anywhere, even outside of the element."""
+
+    def __init__(
+        self,
+        mask: NDArray[np.int32],
+        origin: Point,
+        miss: NDArray[np.int32] = None,
+    ):
         self.tiles = Tiles((mask.shape[0], mask.shape[1]))
         self.tiles.tiles["mask"] = mask
         self.origin = origin
+        if miss is None:
+            self.miss = ~self.tiles.mask
+        else:
+            self.miss = np.asarray(miss, dtype=np.bool_) & ~self.tiles.mask
 
     @property
     def size(self):
@@ -24,14 +42,83 @@ class StructuralElement:
     def w(self):
         return self.tiles.w
 
+    @property
+    def hit(self) -> NDArray[np.bool_]:
+        return self.tiles.mask
+
+    def hit_offsets(self) -> NDArray[np.int32]:
+        """Returns offsets of the hits relative to the origin."""
+        return self.tiles.get_mask_indexes() - (self.origin.y, self.origin.x)
+
+    def miss_offsets(self) -> NDArray[np.int32]:
+        """Returns offsets of the misses relative to the origin."""
+        return np.transpose(np.nonzero(self.miss)) - (
+            self.origin.y,
+            self.origin.x,
+        )
+
+    def reflected(self) -> StructuralElement:
+        """Returns the element reflected through its origin."""
+        return StructuralElement(
+            np.flip(self.hit),
+            Point(self.h - 1 - self.origin.y, self.w - 1 - self.origin.x),
+            np.flip(self.miss),
+        )
+
+    def rotated(self, times: int = 1) -> StructuralElement:
+        """Returns the element rotated by 90 degrees counterclockwise."""
+        origin = self.origin
+        h, w = self.size
+        for _ in range(times % 4):
+            origin = Point(w - 1 - origin.x, origin.y)
+            h, w = w, h
+        return StructuralElement(
+            np.rot90(self.hit, times), origin, np.rot90(self.miss, times)
+        )
+
 
 def corner_se(direction: Direction):
     return CORNER_MASKS[direction.value]
 
 
+def connectivity_se(connectivity: Connectivity) -> StructuralElement:
+    """Returns a 3x3 element of the origin and its neighbours."""
+    return CONNECTIVITY_SES[connectivity]
+
+
+def _neighbourhood_se(connectivity: Connectivity) -> StructuralElement:
+    mask = np.full((3, 3), fill_value=False)
+    mask[1, 1] = True
+    for dy, dx in connectivity.get_adjacency_mask():
+        mask[1 + dy, 1 + dx] = True
+    return StructuralElement(mask, Point(1, 1), miss=np.full((3, 3), False))
+
+
 CORNER_MASKS = [
     StructuralElement(np.array([[0, 0], [1, 0]]), Point(1, 0)),
     StructuralElement(np.array([[1, 0], [0, 0]]), Point(0, 0)),
     StructuralElement(np.array([[0, 1], [0, 0]]), Point(0, 1)),
     StructuralElement(np.array([[0, 0], [0, 1]]), Point(1, 1)),
 ]
+
+CONNECTIVITY_SES = {
+    connectivity: _neighbourhood_se(connectivity)
+    for connectivity in Connectivity
+}
+
+_THINNING_EDGE = StructuralElement(
+    np.array([[0, 0, 0], [0, 1, 0], [1, 1, 1]]),
+    Point(1, 1),
+    miss=np.array([[1, 1, 1], [0, 0, 0], [0, 0, 0]]),
+)
+_THINNING_CORNER = StructuralElement(
+    np.array([[0, 0, 0], [1, 1, 0], [0, 1, 0]]),
+    Point(1, 1),
+    miss=np.array([[0, 1, 1], [0, 0, 1], [0, 0, 0]]),
+)
+
+THINNING_SES = [
+    se.rotated(times)
+    for times in range(4)
+    for se in (_THINNING_EDGE, _THINNING_CORNER)
+]
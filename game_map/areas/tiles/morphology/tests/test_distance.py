@@ -0,0 +1,63 @@
+import unittest
+
+import numpy as np
+
+from game_map.areas.tiles.morphology.distance import (
+    DistanceMetric,
+    distance_transform,
+)
+from game_map.areas.tiles.tiles import Tiles
+
+
+def brute_force(mask, metric):
+    background = np.argwhere(~mask)
+    if len(background) == 0:
+        return np.where(mask, np.inf, 0.0)
+    ys, xs = np.indices(mask.shape)
+    dy = np.abs(ys[..., None] - background[:, 0])
+    dx = np.abs(xs[..., None] - background[:, 1])
+    if metric == DistanceMetric.CITY_BLOCK:
+        distances = dy + dx
+    elif metric == DistanceMetric.CHESSBOARD:
+        distances = np.maximum(dy, dx)
+    else:
+        distances = np.sqrt(dy**2 + dx**2)
+    return distances.min(axis=-1)
+
+
+class TestDistanceTransform(unittest.TestCase):
+    def test_random_masks(self):
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            mask = rng.random(rng.integers(1, 20, 2)) < rng.random()
+            for metric in DistanceMetric:
+                np.testing.assert_allclose(
+                    distance_transform(mask, metric),
+                    brute_force(mask, metric),
+                )
+
+    def test_single_point(self):
+        mask = np.full((5, 7), True)
+        mask[2, 3] = False
+        expected = {
+            DistanceMetric.CITY_BLOCK: 5,
+            DistanceMetric.CHESSBOARD: 3,
+            DistanceMetric.EUCLIDEAN: np.sqrt(13),
+        }
+        for metric, distance in expected.items():
+            result = distance_transform(mask, metric)
+            self.assertEqual(result[2, 3], 0)
+            self.assertAlmostEqual(result[0, 0], distance)
+
+    def test_no_background(self):
+        for metric in DistanceMetric:
+            result = distance_transform(np.full((3, 4), True), metric)
+            self.assertTrue(np.all(np.isinf(result)))
+
+    def test_tiles(self):
+        tiles = Tiles((5, 5))
+        tiles.mask[0, :] = False
+        np.testing.assert_array_equal(
+            tiles.distance_transform(DistanceMetric.CHESSBOARD)[:, 0],
+            [0, 1, 2, 3, 4],
+        )
@@ -0,0 +1,95 @@
+import unittest
+
+import numpy as np
+
+from game_map.areas.tiles.morphology.operations import (
+    closing,
+    dilate,
+    erode,
+    hit_or_miss,
+    opening,
+    thinning,
+)
+from game_map.areas.tiles.morphology.structural_element import (
+    StructuralElement,
+    connectivity_se,
+    corner_se,
+)
+from game_map.areas.tiles.supplementaries import Point
+from game_map.direction.connectivity import Connectivity
+from game_map.direction.direction import Direction
+
+
+def square(size, y, x, h, w):
+    result = np.full(size, fill_value=False)
+    result[y : y + h, x : x + w] = True
+    return result
+
+
+class TestErodeDilate(unittest.TestCase):
+    def test_erode_square(self):
+        eroded = erode(
+            square((6, 6), 1, 1, 4, 4), connectivity_se(Connectivity.EIGHT)
+        )
+        np.testing.assert_array_equal(eroded, square((6, 6), 2, 2, 2, 2))
+
+    def test_border_value(self):
+        se = connectivity_se(Connectivity.FOUR)
+        np.testing.assert_array_equal(
+            erode(np.full((3, 3), True), se), square((3, 3), 1, 1, 1, 1)
+        )
+        self.assertTrue(erode(np.full((3, 3), True), se, True).all())
+
+    def test_origin_outside(self):
+        se = StructuralElement(np.array([[1, 1]]), Point(0, -1))
+        dilated = dilate(square((3, 5), 1, 2, 1, 1), se)
+        np.testing.assert_array_equal(dilated, square((3, 5), 1, 3, 1, 2))
+        np.testing.assert_array_equal(
+            erode(dilated, se), square((3, 5), 1, 2, 1, 1)
+        )
+
+    def test_opening_removes_noise(self):
+        in_tiles = square((8, 8), 1, 1, 5, 5)
+        in_tiles[7, 7] = True
+        se = connectivity_se(Connectivity.EIGHT)
+        np.testing.assert_array_equal(
+            opening(in_tiles, se), square((8, 8), 1, 1, 5, 5)
+        )
+
+    def test_closing_fills_hole(self):
+        in_tiles = square((7, 7), 1, 1, 5, 5)
+        in_tiles[3, 3] = False
+        se = connectivity_se(Connectivity.EIGHT)
+        np.testing.assert_array_equal(
+            closing(in_tiles, se), square((7, 7), 1, 1, 5, 5)
+        )
+
+
+class TestHitOrMiss(unittest.TestCase):
+    def test_corners(self):
+        in_tiles = square((5, 6), 1, 1, 3, 4)
+        np.testing.assert_array_equal(
+            hit_or_miss(in_tiles, corner_se(Direction.NORTH)),
+            square((5, 6), 1, 4, 1, 1),
+        )
+
+    def test_border_ignored_by_default(self):
+        in_tiles = np.full((3, 3), True)
+        self.assertEqual(
+            np.count_nonzero(hit_or_miss(in_tiles, corner_se(Direction.EAST))),
+            1,
+        )
+        self.assertFalse(
+            hit_or_miss(in_tiles, corner_se(Direction.EAST), True).any()
+        )
+
+
+class TestThinning(unittest.TestCase):
+    def test_line_stays(self):
+        line = square((5, 9), 2, 1, 1, 7)
+        np.testing.assert_array_equal(thinning(line), line)
+
+    def test_thick_line(self):
+        thinned = thinning(square((7, 12), 2, 1, 3, 10))
+        self.assertTrue(thinned[3, 3:9].all())
+        self.assertFalse(thinned[2, 3:9].any() or thinned[4, 3:9].any())
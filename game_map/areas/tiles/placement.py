@@ -0,0 +1,115 @@
+"""Vectorized placement search based on summed-area tables."""
+
+from typing import List, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+def summed_area_table(array: NDArray) -> NDArray[np.int64]:
+    """Returns the summed-area table of the array. The table has one extra
+    leading row and column of zeros, so the sum of array[y0:y1, x0:x1] is
+    sat[y1, x1] - sat[y0, x1] - sat[y1, x0] + sat[y0, x0]."""
+    sat = np.zeros((array.shape[0] + 1, array.shape[1] + 1), dtype=np.int64)
+    np.cumsum(array, axis=0, out=sat[1:, 1:])
+    np.cumsum(sat[1:, 1:], axis=1, out=sat[1:, 1:])
+    return sat
+
+
+def rectangle_sum(sat: NDArray, y: int, x: int, h: int, w: int) -> int:
+    """Returns the sum of the rectangle in O(1) using a summed-area table."""
+    return int(sat[y + h, x + w] - sat[y, x + w] - sat[y + h, x] + sat[y, x])
+
+
+def mask_rectangles(mask: NDArray[np.bool_]) -> List[Tuple[int, int, int, int]]:
+    """Decomposes a mask into disjoint rectangles (y, x, h, w). Runs of
+    consecutive rows with the same horizontal runs are merged together, so a
+    rectangle yields one rectangle and an L shape yields two or three."""
+    rectangles = []
+    band_start = 0
+    band_runs = None
+    for y in range(mask.shape[0] + 1):
+        if y < mask.shape[0]:
+            edges = np.flatnonzero(
+                np.diff(np.concatenate(([False], mask[y], [False])))
+            )
+            runs = tuple(zip(edges[::2].tolist(), edges[1::2].tolist()))
+        else:
+            runs = None
+        if runs == band_runs:
+            continue
+        if band_runs:
+            rectangles += [
+                (band_start, start, y - band_start, end - start)
+                for start, end in band_runs
+            ]
+        band_start = y
+        band_runs = runs
+    return rectangles
+
+
+def free_origins(
+    blocked_sat: NDArray, mask: NDArray[np.bool_]
+) -> NDArray[np.bool_]:
+    """Returns a boolean map of all the origins where the mask does not cover
+    any blocked tile. The blocked tiles are given by their summed-area table.
+    The map has a shape of all the origins which keep the bounding box of the
+    mask inside, i.e. (H - h + 1, W - w + 1)."""
+    oh = blocked_sat.shape[0] - mask.shape[0]
+    ow = blocked_sat.shape[1] - mask.shape[1]
+    if oh <= 0 or ow <= 0:
+        return np.zeros((max(0, oh), max(0, ow)), dtype=np.bool_)
+    free = np.ones((oh, ow), dtype=np.bool_)
+    for y, x, h, w in mask_rectangles(mask):
+        free &= (
+            blocked_sat[y + h : y + h + oh, x + w : x + w + ow]
+            - blocked_sat[y : y + oh, x + w : x + w + ow]
+            - blocked_sat[y + h : y + h + oh, x : x + ow]
+            + blocked_sat[y : y + oh, x : x + ow]
+        ) == 0
+    return free
+
+
+class PlacementIndex:
+    """Summed-area table of the unplaceable tiles. It answers whether a
+    rectangle is free in O(1) and finds all the free origins of a mask in one
+    vectorized pass. When tiles become unplaceable, the table is patched with
+    the local change instead of being rebuilt."""
+
+    def __init__(self, placeable: NDArray[np.bool_]):
+        self.sat = summed_area_table(~placeable)
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.sat.shape[0] - 1, self.sat.shape[1] - 1
+
+    def add(self, y: int, x: int, delta: NDArray) -> None:
+        """Adds a change of unplaceable tiles in the window at (y, x). The
+        delta is 1 for tiles which became unplaceable and -1 for tiles which
+        became placeable."""
+        local = summed_area_table(delta)[1:, 1:]
+        y0, x0 = y + 1, x + 1
+        y1, x1 = y0 + delta.shape[0], x0 + delta.shape[1]
+        self.sat[y0:y1, x0:x1] += local
+        self.sat[y0:y1, x1:] += local[:, -1:]
+        self.sat[y1:, x0:x1] += local[-1:, :]
+        self.sat[y1:, x1:] += local[-1, -1]
+
+    def is_free(self, y: int, x: int, h: int, w: int) -> bool:
+        """Checks whether the whole rectangle is placeable."""
+        return rectangle_sum(self.sat, y, x, h, w) == 0
+
+    def is_placable(self, y: int, x: int, mask: NDArray[np.bool_]) -> bool:
+        """Checks whether the mask at (y, x) covers only placeable tiles."""
+        h, w = self.size
+        if not (0 <= y <= h - mask.shape[0] and 0 <= x <= w - mask.shape[1]):
+            return False
+        return all(
+            self.is_free(y + ry, x + rx, rh, rw)
+            for ry, rx, rh, rw in mask_rectangles(mask)
+        )
+
+    def free_origins(self, mask: NDArray[np.bool_]) -> NDArray[np.bool_]:
+        """Returns a boolean map of all the origins where the mask covers only
+        placeable tiles."""
+        return free_origins(self.sat, mask)
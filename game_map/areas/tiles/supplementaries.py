@@ -19,4 +19,55 @@ class Point:
 
     @staticmethod
     def from_tuple(tup: Tuple):
-        return Point(*tup)
+        return Point(int(tup[0]), int(tup[1]))
+
+
+class Rectangle:
+    """An axis aligned rectangle given by its origin and size."""
+
+    def __init__(self, origin: Point, size: Tuple):
+        self.origin = origin
+        self.size = (max(0, size[0]), max(0, size[1]))
+
+    def __eq__(self, other):
+        return self.origin == other.origin and self.size == other.size
+
+    @property
+    def end(self) -> Point:
+        return Point(self.origin.y + self.size[0], self.origin.x + self.size[1])
+
+    def is_empty(self) -> bool:
+        return self.size[0] == 0 or self.size[1] == 0
+
+    def moved(self, offset: Point) -> Rectangle:
+        return Rectangle(self.origin + offset, self.size)
+
+    def intersection(self, other: Rectangle) -> Rectangle:
+        origin = Point(
+            max(self.origin.y, other.origin.y),
+            max(self.origin.x, other.origin.x),
+        )
+        end = Point(min(self.end.y, other.end.y), min(self.end.x, other.end.x))
+        return Rectangle(origin, (end.y - origin.y, end.x - origin.x))
+
+    def union(self, other: Rectangle) -> Rectangle:
+        """Returns the bounding rectangle of both rectangles."""
+        if self.is_empty():
+            return other
+        if other.is_empty():
+            return self
+        origin = Point(
+            min(self.origin.y, other.origin.y),
+            min(self.origin.x, other.origin.x),
+        )
+        end = Point(max(self.end.y, other.end.y), max(self.end.x, other.end.x))
+        return Rectangle(origin, (end.y - origin.y, end.x - origin.x))
+
+    def contains(self, other: Rectangle) -> bool:
+        return self.intersection(other) == other
+
+    def slices(self) -> Tuple[slice, slice]:
+        return (
+            slice(self.origin.y, self.end.y),
+            slice(self.origin.x, self.end.x),
+        )
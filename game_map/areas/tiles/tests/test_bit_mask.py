@@ -0,0 +1,79 @@
+import unittest
+
+import numpy as np
+
+from game_map.areas.tiles.bit_mask import BitMask
+from game_map.areas.tiles.morphology.operations import shifted
+from game_map.areas.tiles.tiles import Tiles
+
+WIDTHS = (1, 63, 64, 65, 130)
+
+
+class TestBitMask(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def masks(self, width):
+        return (
+            self.rng.random((7, width)) > 0.5,
+            self.rng.random((7, width)) > 0.3,
+        )
+
+    def test_round_trip(self):
+        for width in WIDTHS:
+            first, _ = self.masks(width)
+            bits = BitMask.from_array(first)
+            np.testing.assert_array_equal(bits.to_array(), first)
+            self.assertEqual(bits.count(), np.count_nonzero(first))
+
+    def test_set_operations(self):
+        for width in WIDTHS:
+            first, second = self.masks(width)
+            a, b = BitMask.from_array(first), BitMask.from_array(second)
+            for result, expected in (
+                (a | b, first | second),
+                (a & b, first & second),
+                (a - b, first & ~second),
+                (a ^ b, first ^ second),
+                (~a, ~first),
+            ):
+                np.testing.assert_array_equal(result.to_array(), expected)
+                self.assertEqual(result.count(), np.count_nonzero(expected))
+            a -= b
+            np.testing.assert_array_equal(a.to_array(), first & ~second)
+
+    def test_shifted(self):
+        for width in WIDTHS:
+            first, _ = self.masks(width)
+            bits = BitMask.from_array(first)
+            for offset in ((0, 1), (2, -1), (-3, 63), (1, -64), (0, 70)):
+                np.testing.assert_array_equal(
+                    bits.shifted(*offset).to_array(),
+                    shifted(first, np.array(offset)),
+                )
+
+    def test_different_sizes(self):
+        with self.assertRaises(ValueError):
+            BitMask((2, 3)) | BitMask((3, 2))
+
+    def test_tiles(self):
+        tiles = Tiles((5, 70))
+        tiles.mask[2, 3:40] = False
+        bits = tiles.packed()
+        self.assertEqual(bits.count(), np.count_nonzero(tiles.mask))
+        self.assertLess(bits.nbytes, tiles.mask.nbytes)
+        tiles.unpack(~bits, "placeable")
+        np.testing.assert_array_equal(tiles.placable, ~tiles.mask)
+
+    def test_unknown_field(self):
+        tiles = Tiles((3, 4))
+        bits = tiles.packed()
+        with self.assertRaises(ValueError):
+            tiles.unpack(bits, "placable")
+        with self.assertRaises(ValueError):
+            tiles.packed("id")
+        self.assertTrue(tiles.placable.all())
+
+
+if __name__ == "__main__":
+    unittest.main()
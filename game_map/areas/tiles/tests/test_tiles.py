@@ -1,8 +1,17 @@
+import pickle
 import unittest
+from copy import copy
 
+import numpy as np
+
+from game_map.areas.tiles.placement import mask_rectangles
 from game_map.areas.tiles.supplementaries import Point
 from game_map.areas.tiles.tiles import Tiles
+from game_map.direction.connectivity import Connectivity
+from game_map.direction.direction import Direction
+import tile_types
 from tile_types import wall, floor, red
+from utils.utils import to_tuples
 
 
 class TestClipped(unittest.TestCase):
@@ -38,3 +47,212 @@ class TestClipped(unittest.TestCase):
         )
         clipped, origin = original.clipped(Point(3, 3), (10, 5))
         self.assertEqual(clipped.tiles[0, 0], red)
+
+
+class TestFitIn(unittest.TestCase):
+    def test_matches_is_placable(self):
+        rng = np.random.default_rng(0)
+        tiles = Tiles((12, 10))
+        tiles.tiles["placeable"] = rng.random((12, 10)) > 0.2
+        to_fit = Tiles((3, 4))
+        to_fit.tiles["mask"] = rng.random((3, 4)) > 0.3
+        expected = [
+            (y, x)
+            for y, x in np.ndindex(tiles.size)
+            if tiles.is_placable(Point(y, x), to_fit)
+        ]
+        self.assertEqual(to_tuples(tiles.fit_in(to_fit)), expected)
+
+    def test_does_not_fit(self):
+        tiles = Tiles((3, 3))
+        self.assertEqual(tiles.fit_in(Tiles((4, 1))).shape, (0, 2))
+
+
+class TestMaskRectangles(unittest.TestCase):
+    def test_l_shape(self):
+        mask = np.full((4, 5), fill_value=True)
+        mask[:2, 3:] = False
+        self.assertEqual(mask_rectangles(mask), [(0, 0, 2, 3), (2, 0, 2, 5)])
+
+
+class TestInnerBorder(unittest.TestCase):
+    def test_rectangle(self):
+        border = Tiles((4, 5)).inner_border()
+        expected = np.full((4, 5), fill_value=True)
+        expected[1:3, 1:4] = False
+        np.testing.assert_array_equal(border.mask, expected)
+
+    def test_connectivity(self):
+        tiles = Tiles((3, 3))
+        tiles.tiles["mask"][0, 0] = False
+        np.testing.assert_array_equal(
+            tiles.inner_border(Connectivity.FOUR).mask,
+            [[False, True, True], [True, False, True], [True, True, True]],
+        )
+        self.assertTrue(tiles.inner_border(Connectivity.EIGHT).mask[1, 1])
+
+
+class TestFitInDirection(unittest.TestCase):
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(1)
+        tiles = Tiles((15, 15))
+        tiles.tiles["placeable"] = rng.random((15, 15)) > 0.1
+        anchor = Tiles((15, 15), empty=True)
+        anchor.tiles["mask"][5:9, 6] = True
+        to_fit = Tiles((3, 4))
+        to_fit.tiles["mask"][0, 3] = False
+        expected = set()
+        for direction in Direction.get_all_directions():
+            frontier = to_fit.frontier_in_direction(direction.get_opposite())
+            for i in anchor.get_mask_indexes():
+                for j in frontier.get_mask_indexes():
+                    origin = Point(*(i - j))
+                    if tiles.is_placable(origin, to_fit):
+                        expected.add((origin.y, origin.x))
+        result = to_tuples(tiles.fit_in_direction(to_fit, anchor))
+        self.assertEqual(len(result), len(set(result)))
+        self.assertEqual(set(result), expected)
+
+    def test_touching_does_not_collide(self):
+        tiles = Tiles((10, 10))
+        anchor = Tiles((10, 10), empty=True)
+        anchor.tiles["mask"][3:6, 3:6] = True
+        result = tiles.fit_in_touching(Tiles((2, 2)), anchor, Direction.EAST)
+        self.assertEqual(to_tuples(result), [(2, 6), (3, 6), (4, 6), (5, 6)])
+        for y, x in result:
+            self.assertFalse(anchor.collides(Point(y, x), Tiles((2, 2))))
+
+
+class TestCopyOnWrite(unittest.TestCase):
+    def test_mask_change_is_private(self):
+        original = Tiles((4, 4))
+        negated = -original
+        self.assertTrue(original.mask.all())
+        self.assertFalse(negated.mask.any())
+        self.assertTrue(np.shares_memory(negated._tiles, original._tiles))
+
+    def test_write_materializes(self):
+        original = Tiles((4, 4), fill_value=wall)
+        view = copy(original)
+        view.merge(Point(1, 1), Tiles((1, 1), fill_value=red))
+        self.assertEqual(view.tiles[1, 1], red)
+        self.assertEqual(original.tiles[1, 1], wall)
+
+    def test_original_write_does_not_leak(self):
+        original = Tiles((4, 4), fill_value=wall)
+        clipped, _ = original.clipped(Point(0, 0), (2, 2))
+        original.merge(Point(0, 0), Tiles((1, 1), fill_value=red))
+        self.assertEqual(clipped.tiles[0, 0], wall)
+
+    def test_merge_private_mask(self):
+        other = Tiles((2, 2), fill_value=red)
+        view = copy(other)
+        view.mask[0, 0] = False
+        original = Tiles((2, 2), fill_value=wall)
+        original.merge(Point(0, 0), view)
+        self.assertEqual(original.tiles[0, 0], wall)
+        self.assertEqual(original.tiles[1, 1], red)
+
+
+class TestPalette(unittest.TestCase):
+    def test_compact_storage(self):
+        tiles = Tiles((4, 5), fill_value=wall)
+        tiles.tiles[1:3, 1:4] = floor
+        tiles.tiles["mask"][0, 0] = False
+        self.assertEqual(tiles._tiles.itemsize, 3)
+        self.assertEqual(np.count_nonzero(tiles.walkable), 6)
+        np.testing.assert_array_equal(tiles.walkable, tiles.transparent)
+        self.assertEqual(tiles.dark[0, 0], wall["dark"])
+        self.assertFalse(tiles.tiles[0, 0]["mask"])
+        self.assertEqual(tiles.tiles[1, 1], floor)
+        with self.assertRaises(ValueError):
+            tiles.tiles["walkable"] = True
+
+    def test_pickle_translates_ids(self):
+        tiles = Tiles((3, 3), fill_value=red)
+        tiles.tiles[1, 1] = wall
+        expected = np.asarray(tiles.tiles)
+        state = tiles.__getstate__()
+        # As if pickled by a process which added the tile types in reverse.
+        state["_palette"] = state["_palette"][::-1]
+        state["_tiles"] = state["_tiles"].copy()
+        state["_tiles"]["id"] = len(state["_palette"]) - 1 - tiles.ids
+        restored = Tiles.__new__(Tiles)
+        restored.__setstate__(state)
+        np.testing.assert_array_equal(np.asarray(restored.tiles), expected)
+        restored = pickle.loads(pickle.dumps(tiles))
+        np.testing.assert_array_equal(np.asarray(restored.tiles), expected)
+
+    def test_from_records(self):
+        records = np.full((2, 3), fill_value=red)
+        records["placeable"][0, 0] = False
+        tiles = Tiles.from_array(records)
+        np.testing.assert_array_equal(np.asarray(tiles.tiles), records)
+        self.assertEqual(tile_types.PALETTE.records[tiles.ids[0, 0]], red)
+
+    def test_indexed_writes(self):
+        tiles = Tiles((4, 5), fill_value=wall)
+        tiles.tiles[1, 1]["placeable"] = False
+        tiles.tiles[2, 2]["mask"] = False
+        tiles.tiles[0:2, 3:5]["placeable"] = False
+        tiles.tiles[3][0] = floor
+        self.assertFalse(tiles.placable[1, 1])
+        self.assertFalse(tiles.mask[2, 2])
+        self.assertFalse(tiles.placable[0:2, 3:5].any())
+        self.assertEqual(np.count_nonzero(~tiles.placable), 5)
+        self.assertEqual(np.count_nonzero(~tiles.mask), 1)
+        self.assertEqual(tiles.tiles[3, 0], floor)
+        self.assertTrue(tiles.walkable[3, 0])
+
+    def test_indexed_writes_are_private(self):
+        original = Tiles((3, 3), fill_value=wall)
+        view = copy(original)
+        view.tiles[1, 1]["placeable"] = False
+        self.assertTrue(original.placable.all())
+        self.assertFalse(view.placable[1, 1])
+
+    def test_looked_up_fields_are_read_only(self):
+        tiles = Tiles((3, 3), fill_value=wall)
+        with self.assertRaises(ValueError):
+            tiles.tiles["walkable"][0, 0] = True
+        with self.assertRaises(ValueError):
+            tiles.tiles[0:2, 0:2]["dark"][...] = 0
+        with self.assertRaises(ValueError):
+            tiles.walkable[...] = True
+        with self.assertRaises(ValueError):
+            tiles.transparent[1, 1] = True
+        with self.assertRaises(ValueError):
+            tiles.dark[1, 1] = 0
+        with self.assertRaises(ValueError):
+            tiles.ids[...] = 0
+        with self.assertRaises(ValueError):
+            tiles.tiles[[0, 1]]["mask"] = False
+        with self.assertRaises(ValueError):
+            tiles.tiles[tiles.mask]["placeable"] = False
+        np.testing.assert_array_equal(
+            np.asarray(tiles.tiles), np.full((3, 3), fill_value=wall)
+        )
+
+
+class TestPlacementIndex(unittest.TestCase):
+    def test_patch_matches_rebuild(self):
+        tiles = Tiles((10, 12))
+        index = tiles.placement_index()
+        room = Tiles((3, 4))
+        room.mask[0, 0] = False
+        newly_unplaceable = tiles.placable[4:7, 5:9] & room.mask
+        tiles.set_unplaceable(Point(4, 5), room)
+        index.add(4, 5, newly_unplaceable)
+        np.testing.assert_array_equal(index.sat, tiles.placement_index().sat)
+
+    def test_is_placable(self):
+        tiles = Tiles((6, 6))
+        tiles.placable[2, 2] = False
+        index = tiles.placement_index()
+        to_fit = Tiles((2, 2))
+        to_fit.mask[0, 0] = False
+        for y, x in np.ndindex(7, 7):
+            self.assertEqual(
+                index.is_placable(y, x, to_fit.mask),
+                tiles.is_placable(Point(y, x), to_fit),
+            )
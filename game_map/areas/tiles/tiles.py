@@ -2,30 +2,238 @@
 
 from __future__ import annotations
 
-from copy import deepcopy
-from typing import Tuple, List
+from copy import copy
+from typing import Tuple
 
 import numpy as np
 from numpy.typing import NDArray
 
 import tile_types
+from game_map.areas.tiles.bit_mask import BitMask
+from game_map.areas.tiles.morphology.distance import (
+    DistanceMetric,
+    distance_transform,
+)
+from game_map.areas.tiles.placement import (
+    PlacementIndex,
+    free_origins,
+    summed_area_table,
+)
 from game_map.areas.tiles.supplementaries import Point
 from game_map.direction.connectivity import Connectivity
 from game_map.direction.direction import Direction
 
-from utils.utils import add_tuples, subtract_tuples
+
+def _basic(key) -> bool:
+    """Checks whether an index selects a view, not a copy."""
+    if not isinstance(key, tuple):
+        key = (key,)
+    return all(
+        isinstance(k, (int, np.integer, slice)) or k is Ellipsis for k in key
+    )
+
+
+def _read_only(array: NDArray) -> NDArray:
+    array.flags.writeable = False
+    return array
+
+
+class TileArray:
+    """Writable view of tiles in the layout of tile_dt. The mask and the
+    placeable fields are stored in the tiles, the other fields are looked up
+    in the palette and cannot be assigned. Assigning tile records stores
+    their ids.
+
+    Indexing with integers and slices returns a writable view of the indexed
+    tiles, any other index returns read-only tile records. The looked up
+    fields are read-only arrays. Assigning tile records bumps the version of
+    the owning tiles."""
+
+    __hash__ = None
+
+    def __init__(self, cells: NDArray, owner: Tiles = None):
+        self._cells = cells
+        self._owner = owner
+
+    @property
+    def shape(self) -> Tuple:
+        return self._cells.shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        return tile_types.tile_dt
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __array__(self, dtype=None, copy=None) -> NDArray:
+        records = tile_types.PALETTE.records_of(self._cells)
+        return records if dtype is None else records.astype(dtype)
+
+    def __eq__(self, other):
+        return np.asarray(self) == other
+
+    def __ne__(self, other):
+        return np.asarray(self) != other
+
+    def copy(self) -> NDArray:
+        return tile_types.PALETTE.records_of(self._cells)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key in tile_types.CELL_FIELDS:
+                return self._cells[key]
+            return _read_only(tile_types.PALETTE.table(key)[self._cells["id"]])
+        if _basic(key):
+            # A view even of a single tile, so its fields can be assigned.
+            key = key if isinstance(key, tuple) else (key,)
+            if not any(k is Ellipsis for k in key):
+                key += (...,)
+            return TileArray(self._cells[key], self._owner)
+        return _read_only(tile_types.PALETTE.records_of(self._cells[key]))
+
+    def __setitem__(self, key, value) -> None:
+        if isinstance(key, str):
+            if key not in tile_types.CELL_FIELDS:
+                raise ValueError(f"Field {key} is defined by the tile types.")
+            self._cells[key] = value
+        else:
+            self._cells[key] = tile_types.PALETTE.cells(value)
+            if self._owner is not None:
+                self._owner.version += 1
 
 
 class Tiles:
-    """Represents an array of tiles."""
+    """Represents an array of tiles.
+
+    Every tile stores the id of its tile type in the palette with its mask and
+    placeable fields, the other fields are looked up by the ids.
+
+    A copy of tiles is a lightweight view which shares the tile array with the
+    original. The mask and the placeable fields are copied privately on their
+    first access, any other write materializes a private tile array. Arrays
+    returned by the properties are not meant to be kept across copies.
+
+    The version is bumped whenever the tile types change, so the caches of
+    the walkable and transparent fields can tell when they are stale."""
+
+    version = 0
 
     def __init__(
         self, size: Tuple, fill_value=tile_types.floor, empty: bool = False
     ) -> None:
-        self._tiles = np.full(size, fill_value=fill_value)
+        self._tiles = np.full(
+            size, fill_value=tile_types.PALETTE.cells(fill_value)
+        )
+        # Number of tiles sharing the tile array, shared among all of them.
+        self._owners = [1]
+        self._mask = None
+        self._placeable = None
         if empty:
             self._tiles["mask"] = False
 
+    @staticmethod
+    def from_array(array: NDArray, shared: bool = False) -> Tiles:
+        """Wraps an array of cell_dt without copying it. A shared array, e.g. a
+        read-only memory map, is never written to, it is copied on the first
+        write instead. An array of tile_dt is converted."""
+        if array.dtype == tile_types.tile_dt:
+            array, shared = tile_types.PALETTE.cells(array), False
+        if array.dtype != tile_types.cell_dt:
+            raise ValueError("Array is not of the tile type.")
+        result = Tiles.__new__(Tiles)
+        result._tiles = array
+        # The extra owner of a shared array is never released.
+        result._owners = [2 if shared else 1]
+        result._mask = None
+        result._placeable = None
+        return result
+
+    def __copy__(self) -> Tiles:
+        return self._view(...)
+
+    def __deepcopy__(self, memo) -> Tiles:
+        result = Tiles.__new__(Tiles)
+        result._tiles = self._merged().copy()
+        result._owners = [1]
+        result._mask = None
+        result._placeable = None
+        return result
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.update(
+            _tiles=self._merged(),
+            _owners=[1],
+            _mask=None,
+            _placeable=None,
+            _palette=tile_types.PALETTE.records,
+        )
+        return state
+
+    def __setstate__(self, state):
+        palette = state.pop("_palette")
+        self.__dict__.update(state)
+        ids = tile_types.PALETTE.ids(palette)
+        if not np.array_equal(ids, np.arange(len(palette))):
+            self._tiles = self._tiles.copy()
+            self._tiles["id"] = ids[self._tiles["id"]]
+
+    def __del__(self):
+        self._release()
+
+    def _view(self, index) -> Tiles:
+        """Returns a view of the indexed tiles sharing the tile array."""
+        view = Tiles.__new__(Tiles)
+        view._tiles = self._tiles[index]
+        view._owners = self._owners
+        view._owners[0] += 1
+        view._mask = None if self._mask is None else self._mask[index].copy()
+        view._placeable = (
+            None if self._placeable is None else self._placeable[index].copy()
+        )
+        return view
+
+    def _release(self) -> None:
+        owners = self.__dict__.get("_owners")
+        if owners is not None:
+            owners[0] -= 1
+            self._owners = None
+
+    def _shared(self) -> bool:
+        return self._owners[0] > 1
+
+    def _field(self, name: str) -> NDArray:
+        """Returns a field for reading only."""
+        if name == "mask" and self._mask is not None:
+            return self._mask
+        if name == "placeable" and self._placeable is not None:
+            return self._placeable
+        return self._tiles[name]
+
+    def _merged(self) -> NDArray:
+        """Returns the tile array with the private fields for reading only."""
+        if self._mask is None and self._placeable is None:
+            return self._tiles
+        merged = self._tiles.copy()
+        merged["mask"] = self._field("mask")
+        merged["placeable"] = self._field("placeable")
+        return merged
+
+    def _materialize(self) -> None:
+        """Makes the tile array private and writable."""
+        if self._shared():
+            tiles = self._tiles.copy()
+            self._release()
+            self._tiles = tiles
+            self._owners = [1]
+        if self._mask is not None:
+            self._tiles["mask"] = self._mask
+            self._mask = None
+        if self._placeable is not None:
+            self._tiles["placeable"] = self._placeable
+            self._placeable = None
+
     @property
     def size(self):
         return self._tiles.shape
@@ -40,63 +248,82 @@ class Tiles:
 
     @property
     def mask(self):
-        return self._tiles["mask"]
+        if self._mask is None and self._shared():
+            self._mask = self._tiles["mask"].copy()
+        return self._field("mask")
 
     @property
     def placable(self):
-        return self._tiles["placeable"]
+        if self._placeable is None and self._shared():
+            self._placeable = self._tiles["placeable"].copy()
+        return self._field("placeable")
+
+    @property
+    def ids(self) -> NDArray[np.uint8]:
+        """The ids of the tile types for reading only."""
+        return _read_only(self._tiles["id"].view())
 
     @property
-    def walkable(self):
-        return self._tiles["walkable"]
+    def walkable(self) -> NDArray[np.bool_]:
+        return _read_only(
+            tile_types.PALETTE.table("walkable")[self._tiles["id"]]
+        )
+
+    @property
+    def transparent(self) -> NDArray[np.bool_]:
+        return _read_only(
+            tile_types.PALETTE.table("transparent")[self._tiles["id"]]
+        )
+
+    @property
+    def dark(self) -> NDArray:
+        return _read_only(tile_types.PALETTE.table("dark")[self._tiles["id"]])
 
     @mask.setter
     def mask(self, mask):
-        self._tiles["mask"] = mask
-        self._tiles["placeable"] &= self._tiles["mask"]
+        self.mask[...] = mask
+        self.placable[...] &= self.mask
 
     @property
-    def tiles(self):
-        return self._tiles
+    def tiles(self) -> TileArray:
+        self._materialize()
+        return TileArray(self._tiles, self)
 
     def __sub__(self, other: Tiles) -> Tiles:
         if not self.same_size(other):
             raise ValueError("Operation with tiles of different sizes.")
-        result = deepcopy(self)
-        result._tiles["mask"] = self.mask & ~other.mask
+        result = copy(self)
+        result -= other
         result.tighten()
         return result
 
     def __isub__(self, other: Tiles) -> Tiles:
         if not self.same_size(other):
             raise ValueError("Operation with tiles of different sizes.")
-        self._tiles["mask"] = self.mask & ~other.mask
+        self.mask[...] &= ~other.mask
         # self.tighten()
         return self
 
     def __add__(self, other: Tiles) -> Tiles:
         if not self.same_size(other):
             raise ValueError("Operation with tiles of different sizes.")
-        result = deepcopy(self)
-        result._tiles[other.mask] = other._tiles
+        result = copy(self)
+        result += other
         return result
 
     def __iadd__(self, other: Tiles) -> Tiles:
         if not self.same_size(other):
             raise ValueError("Operation with tiles of different sizes.")
-        self._tiles[other.mask] = other._tiles
+        self.merge(Point(0, 0), other)
         return self
 
     def __neg__(self):
-        result = deepcopy(self)
-        result._tiles["mask"] = ~self.mask
+        result = copy(self)
+        result.mask[...] = ~self.mask
         return result
 
-    def set_unplaceable(self, p: Point, other: tiles):
-        self.tiles["placeable"][p.y : p.y + other.h, p.x : p.x + other.w] = (
-            self.tiles["placeable"][p.y : p.y + other.h, p.x : p.x + other.w]
-            & ~other.mask
-        )
+    def set_unplaceable(self, p: Point, other: Tiles):
+        self.placable[p.y : p.y + other.h, p.x : p.x + other.w] &= ~other.mask
 
     def point_in_bbox(
         self,
@@ -121,10 +348,13 @@ class Tiles:
         )
 
     def collides(self, p: Point, other: Tiles) -> bool:
-        return np.all(
-            other.clipped(p, self.size).mask
+        """Checks whether the other tiles at the position intersects the
+        mask."""
+        clipped, origin = other.clipped(p, self.size)
+        return np.any(
+            clipped.mask
             & self.mask[
-                max(0, p.y) : p.y + other.h, max(0, p.x) : p.x + other.w
+                origin.y : origin.y + clipped.h, origin.x : origin.x + clipped.w
             ]
         )
 
@@ -137,7 +367,7 @@ class Tiles:
     def frontier_in_direction(self, direction: Direction) -> Tiles:
         """Returns a tile object that borders with background in the direction."""
         moved = self.moved_mask(direction.get_opposite())
-        frontier = deepcopy(self)
+        frontier = copy(self)
         frontier -= moved
         return frontier
 
@@ -169,48 +399,89 @@ class Tiles:
         if xl > xr or yl > yr:
             return Tiles((0, 0)), Point(0, 0)
 
-        clipped = Tiles((yr - yl, xr - xl), empty=True)
-        clipped._tiles = deepcopy(self._tiles[yl:yr, xl:xr])
+        clipped = self._view((slice(yl, yr), slice(xl, xr)))
         return clipped, Point(max(0, p.y), max(0, p.x))
 
+    def window(self, p: Point, size: Tuple) -> Tiles:
+        """Returns a copy-on-write view of the tiles in the window of the given
+        size at the given position. The window has to be inside the bounding
+        box."""
+        return self._view(
+            (slice(p.y, p.y + size[0]), slice(p.x, p.x + size[1]))
+        )
+
     def moved_mask(self, direction: Direction, offset: int = 1) -> Tiles:
+        from game_map.areas.tiles.morphology.operations import shifted
+
         moved = Tiles(self.size, empty=True)
-        if offset == 0:
-            moved._tiles["mask"] = self.mask
-            return moved
-        object_indexes = self.get_mask_indexes()
-        moved_indexes = object_indexes + direction.coordinates() * offset
-        moved_indexes = self.clip_indexes(moved_indexes)
-        moved.set_mask_indexes(moved_indexes)
+        moved.tiles["mask"] = shifted(
+            self.mask, direction.coordinates() * offset
+        )
         return moved
 
     def flip(self) -> None:
+        self.version += 1
         self._tiles = np.flip(self._tiles)
+        if self._mask is not None:
+            self._mask = np.flip(self._mask)
+        if self._placeable is not None:
+            self._placeable = np.flip(self._placeable)
 
     def fill(self, fill_value) -> None:
-        self._tiles = np.full(self.size, fill_value=fill_value)
+        tiles = np.full(
+            self.size, fill_value=tile_types.PALETTE.cells(fill_value)
+        )
+        self._release()
+        self._tiles = tiles
+        self._owners = [1]
+        self._mask = None
+        self._placeable = None
+        self.version += 1
+
+    def inner_border_mask(
+        self, connectivity: Connectivity = Connectivity.EIGHT
+    ) -> NDArray[np.bool_]:
+        """Returns the inner border of the mask as a boolean array. A tile is
+        interior when all its neighbours are in the mask, tiles outside the
+        bounding box count as background."""
+        from game_map.areas.tiles.morphology.operations import erode
+        from game_map.areas.tiles.morphology.structural_element import (
+            connectivity_se,
+        )
+
+        return self.mask & ~erode(self.mask, connectivity_se(connectivity))
 
     def inner_border(
         self, connectivity: Connectivity = Connectivity.EIGHT
     ) -> Tiles:
         """Returns the inner border of the mask. A border tile is the one connected to
         background."""
-        kernel = connectivity.get_adjacency_mask()
-        border = deepcopy(self)
-        border.clear_mask()
-        for i in np.ndindex(self.size):
-            if not self.mask[i]:
-                continue
-            for k in kernel:
-                n = add_tuples(i, k)
-                if (
-                    not self.point_in_bbox(Point(n[0], n[1]))
-                    or not self.mask[n]
-                ):
-                    border.mask[i] = True
-                    break
+        border = copy(self)
+        border.mask[...] = self.inner_border_mask(connectivity)
         return border
 
+    def packed(self, name: str = "mask") -> BitMask:
+        """Returns the mask or the placeable field packed into bits."""
+        if name not in tile_types.CELL_FIELDS:
+            raise ValueError(f"Field {name} cannot be packed.")
+        return BitMask.from_array(self._field(name))
+
+    def unpack(self, bits: BitMask, name: str = "mask") -> None:
+        """Sets the mask or the placeable field from packed bits."""
+        if name not in tile_types.CELL_FIELDS:
+            raise ValueError(f"Field {name} cannot be packed.")
+        if bits.shape != self.size:
+            raise ValueError("Operation with tiles of different sizes.")
+        field = self.mask if name == "mask" else self.placable
+        field[...] = bits.to_array()
+
+    def distance_transform(
+        self, metric: DistanceMetric = DistanceMetric.EUCLIDEAN
+    ) -> NDArray[np.float64]:
+        """Returns the distance of every tile of the mask to the nearest tile
+        outside of it."""
+        return distance_transform(self._field("mask"), metric)
+
     def corners(self, direction: Direction) -> Tiles:
         """Returns corners of the set in a given direction. The direction and its
         clockwise neighbour specifies the corner orientation."""
@@ -234,32 +505,43 @@ class Tiles:
 
     def merge_mask(self, p: Point, other: Tiles) -> None:
         """Performs a union of two tiles at the given position."""
-        mask_copy = deepcopy(self.mask)
-        mask_copy[p.y : p.y + other.h, p.x : p.x + other.w] = other.mask
-        self.mask = mask_copy
+        window = (slice(p.y, p.y + other.h), slice(p.x, p.x + other.w))
+        self.mask[window] = other.mask
+        self.placable[window] &= self.mask[window]
 
     def merge(self, p: Point, other: Tiles) -> None:
         """Performs a union of two tiles at the given position."""
-        self._tiles[p.y : p.y + other.h, p.x : p.x + other.w][other.mask] = (
-            other._tiles[other.mask]
-        )
+        mask = other._field("mask")
+        self._materialize()
+        window = self._tiles[p.y : p.y + other.h, p.x : p.x + other.w]
+        window[mask] = other._tiles[mask]
+        window["mask"][mask] = True
+        window["placeable"][mask] = other._field("placeable")[mask]
+        self.version += 1
+
+    def draw(self, p: Point, other: Tiles) -> None:
+        """Copies the tile types of the other tiles under its mask to the
+        given position, the mask and the placeable fields are kept."""
+        mask = other._field("mask")
+        self._materialize()
+        window = self._tiles[p.y : p.y + other.h, p.x : p.x + other.w]
+        window["id"][mask] = other._tiles["id"][mask]
+        self.version += 1
 
     def merger(self, p: Point, other: Tiles) -> Tiles:
         """Returns a union of two tiles."""
-        union = deepcopy(self)
+        union = copy(self)
         union.merge(p, other)
         return union
 
     def subtract_mask(self, p: Point, other: Tiles) -> None:
         """Subtracts two tiles at the given position."""
-        mask_copy = deepcopy(self.mask)
-        mask_copy[p.y : p.y + other.h, p.x : p.x + other.w] = (
-            mask_copy[p.y : p.y + other.h, p.x : p.x + other.w] & ~other.mask
-        )
-        self.mask = mask_copy
+        window = (slice(p.y, p.y + other.h), slice(p.x, p.x + other.w))
+        self.mask[window] &= ~other.mask
+        self.placable[window] &= self.mask[window]
 
     def mask_subtraction(self, p: Point, other: Tiles) -> Tiles:
-        difference = deepcopy(self)
+        difference = copy(self)
         difference.subtract_mask(p, other)
         return difference
 
@@ -273,38 +555,67 @@ class Tiles:
 
     def mask_intersection(self, p: Point, other: Tiles) -> Tiles:
         """Returns an intersection of two tiles."""
-        intersection = deepcopy(self)
+        intersection = copy(self)
         intersection.intersect_mask(p, other)
         return intersection
 
-    def fit_in(self, to_fit: Tiles) -> List[Point]:
-        valid_points = []
-        mask_indexes = self.get_mask_indexes()
-        for i in mask_indexes:
-            origin = Point.from_tuple(i)
-            if self.is_placable(origin, to_fit):
-                valid_points.append(origin)
-        return valid_points
+    def placement_index(self) -> PlacementIndex:
+        """Returns a new index of the placeable tiles."""
+        return PlacementIndex(self.placable)
+
+    def placeable_origins(
+        self, to_fit: Tiles, index: PlacementIndex = None
+    ) -> NDArray[np.bool_]:
+        """Returns a boolean map of the size of the tiles marking every origin
+        where the other tiles is placable. All the origins are computed at once
+        from the placement index, which is built if not given."""
+        if index is None:
+            index = self.placement_index()
+        origins = np.full(self.size, fill_value=False)
+        free = index.free_origins(to_fit.mask)
+        origins[: free.shape[0], : free.shape[1]] = free
+        return origins
+
+    def fit_in(
+        self, to_fit: Tiles, index: PlacementIndex = None
+    ) -> NDArray[np.int32]:
+        """Returns all the origins inside the mask where the other tiles is
+        placable in shape (<number_of_origins>, 2)."""
+        return np.transpose(
+            np.nonzero(self.placeable_origins(to_fit, index) & self.mask)
+        )
+
+    def touching_origins(
+        self, to_fit: Tiles, anchor: Tiles, direction: Direction
+    ) -> NDArray[np.bool_]:
+        """Returns a boolean map of all the origins where the frontier of the
+        other tiles in the opposite direction lies on the anchor. It is a
+        dilation of the anchor by the reflected frontier."""
+        from game_map.areas.tiles.morphology.operations import dilate
+        from game_map.areas.tiles.morphology.structural_element import (
+            StructuralElement,
+        )
+
+        if not self.same_size(anchor):
+            raise ValueError("Operation with tiles of different sizes.")
+        frontier = to_fit.frontier_in_direction(direction.get_opposite())
+        se = StructuralElement(frontier.mask, Point(0, 0))
+        return dilate(anchor.mask, se.reflected())
 
     def fit_in_direction(
         self,
         to_fit: Tiles,
         anchor: Tiles,
         directions: Tuple = Direction.get_all_directions(),
-    ) -> List[Point]:
-        valid_points = []
-        anchor_touch_indexes = anchor.get_mask_indexes()
+        index: PlacementIndex = None,
+    ) -> NDArray[np.int32]:
+        """Returns all the origins where the other tiles is placable and its
+        frontier in any of the opposite directions lies on the anchor."""
+        candidates = np.full(self.size, fill_value=False)
         for direction in directions:
-            set_touch_indexes = to_fit.frontier_in_direction(
-                direction.get_opposite()
-            ).get_mask_indexes()
-            for i in anchor_touch_indexes:
-                for j in set_touch_indexes:
-                    origin = Point(*subtract_tuples(i, j))
-                    if not self.is_placable(origin, to_fit):
-                        continue
-                    valid_points.append(origin)
-        return valid_points
+            candidates |= self.touching_origins(to_fit, anchor, direction)
+        candidates &= self.placeable_origins(to_fit, index)
+        return np.transpose(np.nonzero(candidates))
 
     def fit_in_touching(
         self,
@@ -312,24 +623,18 @@ class Tiles:
         anchor: Tiles,
         direction: Direction,
         offset: int = 0,
-    ) -> List[Point] | None:
+        index: PlacementIndex = None,
+    ) -> NDArray[np.int32]:
         """Fits in another tiles touching the anchor in the given direction. The new
         tiles will not collide with the anchor."""
         anchor_touch_set = anchor.moved_mask(direction, offset + 1)
         anchor_touch_set -= anchor.moved_mask(direction, offset)
-        anchor_touch_indexes = anchor_touch_set.get_mask_indexes()
-
-        set_touch_indexes = to_fit.frontier_in_direction(
-            direction.get_opposite()
-        ).get_mask_indexes()
-
-        valid_points = []
-        for i in anchor_touch_indexes:
-            for j in set_touch_indexes:
-                origin = Point(*subtract_tuples(i, j))
-                if not self.is_placable(origin, to_fit):
-                    continue
-                if anchor.collides(origin, to_fit):
-                    continue
-                valid_points.append(origin)
-        return valid_points
+        candidates = self.touching_origins(to_fit, anchor_touch_set, direction)
+        candidates &= self.placeable_origins(to_fit, index)
+        not_colliding = free_origins(
+            summed_area_table(anchor.mask), to_fit.mask
+        )
+        candidates[
+            : not_colliding.shape[0], : not_colliding.shape[1]
+        ] &= not_colliding
+        return np.transpose(np.nonzero(candidates))
@@ -0,0 +1,111 @@
+"""Field of view over the transparent tiles of a map."""
+
+from collections import OrderedDict
+from typing import List, Tuple
+
+import numpy as np
+import tcod.constants
+import tcod.map
+from numpy.typing import NDArray
+
+from game_map.areas.simple_area import SimpleArea
+from game_map.areas.tiles.supplementaries import Point, Rectangle
+
+
+class FieldOfView:
+    """Computes what can be seen from a position with symmetric shadowcasting
+    and remembers what the viewer sees and has seen. Only the window within
+    the radius around a position is computed. The fields of the positions are
+    cached until the version of the area or of its tiles changes, so any
+    number of viewers standing still cost nothing."""
+
+    def __init__(
+        self,
+        area: SimpleArea,
+        radius: int = 8,
+        algorithm: int = tcod.constants.FOV_SYMMETRIC_SHADOWCAST,
+        max_cached: int = 1024,
+    ):
+        self.area = area
+        self.radius = radius
+        self.algorithm = algorithm
+        self.max_cached = max_cached
+        self.visible = np.full(area.size, fill_value=False)
+        self.explored = np.full(area.size, fill_value=False)
+        # Regions where visible or explored changed since the last draw.
+        self.dirty: List[Rectangle] = []
+        self._visible_window = Rectangle(Point(0, 0), (0, 0))
+        self._version = None
+        self._transparency = None
+        self._fields = OrderedDict()
+
+    @property
+    def window(self) -> Rectangle:
+        """The window around the viewer, nothing outside it is visible."""
+        return self._visible_window
+
+    def _refresh(self) -> None:
+        version = (self.area.version, self.area.tiles.version)
+        if self._version != version:
+            self._version = version
+            self._transparency = None
+            self._fields.clear()
+
+    @property
+    def transparency(self) -> NDArray[np.bool_]:
+        self._refresh()
+        if self._transparency is None:
+            self._transparency = self.area.tiles.transparent
+        return self._transparency
+
+    def _window(self, position: Point) -> Rectangle:
+        whole = Rectangle(Point(0, 0), self.area.size)
+        if self.radius == 0:
+            return whole
+        r = self.radius
+        return Rectangle(
+            Point(position.y - r, position.x - r), (2 * r + 1, 2 * r + 1)
+        ).intersection(whole)
+
+    def field(self, position: Point) -> Tuple[Rectangle, NDArray[np.bool_]]:
+        """Returns the window around the position and the tiles visible from
+        the position inside it."""
+        self._refresh()
+        key = (int(position.y), int(position.x))
+        field = self._fields.get(key)
+        if field is not None:
+            self._fields.move_to_end(key)
+            return field
+        window = self._window(position)
+        visible = tcod.map.compute_fov(
+            self.transparency[window.slices()],
+            (position.y - window.origin.y, position.x - window.origin.x),
+            self.radius,
+            light_walls=True,
+            algorithm=self.algorithm,
+        )
+        visible.flags.writeable = False
+        field = self._fields[key] = (window, visible)
+        if len(self._fields) > self.max_cached:
+            self._fields.popitem(last=False)
+        return field
+
+    def can_see(self, viewer: Point, target: Point) -> bool:
+        """Checks whether the target is visible from the viewer."""
+        window, visible = self.field(viewer)
+        y, x = target.y - window.origin.y, target.x - window.origin.x
+        return (
+            0 <= y < window.size[0]
+            and 0 <= x < window.size[1]
+            and bool(visible[y, x])
+        )
+
+    def update(self, position: Point) -> None:
+        """Moves the viewer to the position. The visible tiles are replaced by
+        the ones seen from there and added to the explored tiles."""
+        window, visible = self.field(position)
+        self.visible[self._visible_window.slices()] = False
+        self.visible[window.slices()] = visible
+        self.explored[window.slices()] |= visible
+        self.dirty.append(self._visible_window.union(window))
+        self._visible_window = window
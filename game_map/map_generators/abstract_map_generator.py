@@ -3,20 +3,26 @@ from typing import Tuple
 
 from game_map import GameMap
 from game_map.areas.random_simple_areas import DimensionRange
+from game_map.map_generators.metrics import NULL_METRICS, GenerationMetrics
 
 
 class AbstractMapGenerator(ABC):
+    # Bumped whenever the generated maps change, so cached maps are not reused.
+    version: int = 3
+
     def __init__(
         self,
         game_map: GameMap,
         room_size_factors: Tuple[float, float],
         density: float,
+        metrics: GenerationMetrics = NULL_METRICS,
     ):
         self.game_map = game_map
         self.room_size_range = DimensionRange.from_size(
             game_map.size, room_size_factors
         )
         self.density = density
+        self.metrics = metrics
 
     @abstractmethod
     def get_room(self):
@@ -0,0 +1,135 @@
+import hashlib
+import os
+import pickle
+import random
+from typing import Optional, Tuple, Type
+
+from game_map import GameMap
+from game_map.map_generators.abstract_map_generator import AbstractMapGenerator
+from game_map.map_generators.metrics import NULL_METRICS, GenerationMetrics
+
+
+class MapCache:
+    """On-disk cache of generated maps. A map is keyed by the generator, its
+    version and parameters, the size of the map, the seed and the debug mode
+    of Python. The finished maps are pickled together with their rooms and
+    room graph. When the cache outgrows its limit, the least recently used
+    maps are evicted."""
+
+    SUFFIX = ".map"
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 2**20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(
+        generator: Type[AbstractMapGenerator],
+        size: Tuple[int, int],
+        room_size_factors: Tuple[float, float],
+        density: float,
+        seed: int,
+    ) -> str:
+        parameters = (
+            generator.__module__,
+            generator.__qualname__,
+            generator.version,
+            tuple(size),
+            tuple(room_size_factors),
+            density,
+            seed,
+            # The code run only in the debug mode changes the generated maps.
+            __debug__,
+        )
+        return hashlib.sha256(repr(parameters).encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def get(self, key: str) -> Optional[GameMap]:
+        """Returns the cached map or None. A hit refreshes the map's position
+        in the eviction order. A map which cannot be loaded, e.g. pickled by
+        an older version of the code, is removed."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                game_map = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (
+            EOFError,
+            pickle.UnpicklingError,
+            AttributeError,
+            ImportError,
+        ):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return game_map
+
+    def put(self, key: str, game_map: GameMap) -> None:
+        """Stores the map and evicts the least recently used maps over the
+        limit."""
+        path = self._path(key)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            pickle.dump(game_map, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes the least recently used maps until the cache fits into its
+        limit."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.SUFFIX):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    # Removed by another process since the scan.
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def generate(
+        self,
+        generator: Type[AbstractMapGenerator],
+        size: Tuple[int, int],
+        room_size_factors: Tuple[float, float],
+        density: float,
+        seed: int,
+        metrics: GenerationMetrics = NULL_METRICS,
+    ) -> GameMap:
+        """Returns the cached map or generates it with the seed and caches
+        it. The generators draw from the global random generator, its state
+        is restored afterwards, so the seed does not leak to the caller."""
+        key = self.key(generator, size, room_size_factors, density, seed)
+        game_map = self.get(key)
+        metrics.count("cache.hits" if game_map is not None else "cache.misses")
+        if game_map is None:
+            state = random.getstate()
+            random.seed(seed)
+            try:
+                game_map = GameMap(size)
+                generator(
+                    game_map, room_size_factors, density, metrics
+                ).generate()
+            finally:
+                random.setstate(state)
+            self.put(key, game_map)
+        return game_map
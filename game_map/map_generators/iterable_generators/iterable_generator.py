@@ -1,9 +1,21 @@
 import logging
 from abc import abstractmethod
-from typing import Tuple
+from typing import Iterator, NamedTuple, Optional, Tuple
 
 from game_map import GameMap
+from game_map.areas.rooms.rooms import Room
+from game_map.areas.tiles.supplementaries import Point
 from game_map.map_generators.abstract_map_generator import AbstractMapGenerator
+from game_map.map_generators.metrics import NULL_METRICS, GenerationMetrics
+
+
+class Placement(NamedTuple):
+    """A room placed by a generator at the origin next to the neighbour,
+    which is None for the first room."""
+
+    room: Room
+    origin: Point
+    neighbour: Optional[Room]
 
 
 class IterableGenerator(AbstractMapGenerator):
@@ -12,20 +24,41 @@ class IterableGenerator(AbstractMapGenerator):
         game_map: GameMap,
         room_size_factors: Tuple[float, float],
         density: float,
+        metrics: GenerationMetrics = NULL_METRICS,
     ):
-        super().__init__(game_map, room_size_factors, density)
-        self.logger = logging.getLogger()
-        logging.basicConfig(level=logging.INFO)
+        super().__init__(game_map, room_size_factors, density, metrics)
+        self.logger = logging.getLogger(type(self).__module__)
 
     @abstractmethod
-    def prepare(self):
+    def prepare(self) -> Optional[Placement]:
+        """Places the first room and returns its placement if any."""
         pass
 
     @abstractmethod
-    def add_room(self):
+    def add_room(self) -> Optional[Placement]:
+        """Tries to place another room and returns its placement if any."""
         pass
 
+    @abstractmethod
+    def is_exhausted(self) -> bool:
+        """Checks whether no more rooms can be added."""
+        pass
+
+    def iter_generate(self) -> Iterator[Placement]:
+        """Generates the map step by step and yields every placement as soon
+        as the room is in the map. The caller can render or save the partial
+        map between the steps, or stop early by not asking for more."""
+        placement = self.prepare()
+        if placement is not None:
+            yield placement
+        while (
+            self.game_map.density() < self.density and not self.is_exhausted()
+        ):
+            placement = self.add_room()
+            if placement is not None:
+                yield placement
+
     def generate(self):
-        self.prepare()
-        while self.game_map.density() < self.density:
-            self.add_room()
+        with self.metrics.timer("generate"):
+            for _ in self.iter_generate():
+                pass
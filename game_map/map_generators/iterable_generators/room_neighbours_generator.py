@@ -1,12 +1,13 @@
-import logging
 import random
-from typing import Tuple
+from typing import Optional, Tuple
 
 from game_map import GameMap
 from game_map.areas.rooms.rooms import LRoom, Room
 from game_map.map_generators.iterable_generators.iterable_generator import (
     IterableGenerator,
+    Placement,
 )
+from game_map.map_generators.metrics import NULL_METRICS, GenerationMetrics
 from tile_types import active_room, wall, red
 
 
@@ -16,30 +17,40 @@ class RoomNeighboursGenerator(IterableGenerator):
         game_map: GameMap,
         room_size_factors: Tuple[float, float],
         density: float,
+        metrics: GenerationMetrics = NULL_METRICS,
     ):
-        super().__init__(game_map, room_size_factors, density)
+        super().__init__(game_map, room_size_factors, density, metrics)
         self.to_process: list[Room] = []
 
     def get_room(self):
-        size = self.room_size_range.sample()
-        choice = random.random()
-        if choice > 0.7:
-            room = LRoom(size)
-        else:
-            room = Room(size)
+        with self.metrics.timer("construction"):
+            size = self.room_size_range.sample()
+            choice = random.random()
+            if choice > 0.7:
+                room = LRoom.from_prototype(size)
+            else:
+                room = Room.from_prototype(size)
         return room
 
-    def prepare(self):
+    def prepare(self) -> Optional[Placement]:
         start_room = self.get_room()
-        self.game_map.place_in_randomly(
-            self.game_map.fit_in(start_room), start_room
-        )
+        with self.metrics.timer("fit"):
+            candidates = self.game_map.fit_in(start_room)
+        self.metrics.observe("candidates", len(candidates))
+        with self.metrics.timer("placement"):
+            placed = self.game_map.place_in_randomly(candidates, start_room)
         self.to_process.append(start_room)
+        if placed:
+            return Placement(start_room, start_room.origin, None)
+        return None
+
+    def is_exhausted(self) -> bool:
+        return len(self.to_process) == 0
 
-    def add_room(self):
+    def add_room(self) -> Optional[Placement]:
         if len(self.to_process) == 0:
-            self.logger.info("No more rooms to process.")
-            return
+            self.logger.debug("No more rooms to process.")
+            return None
         tries = 0
         if __debug__:
             for room in self.to_process:
@@ -49,23 +60,29 @@ class RoomNeighboursGenerator(IterableGenerator):
             neighbour.fill_border(active_room)
         while tries < 20:
             room = self.get_room()
-            placed = self.game_map.place_room_next_to(room, neighbour)
-            self.logger.info(
-                (
-                    "Tried to place ,",
-                    room.size,
-                    "at ",
-                    room.origin.y,
-                    room.origin.x,
+            tries += 1
+            self.metrics.count("tries")
+            with self.metrics.timer("fit"):
+                candidates = self.game_map.fit_next_to(room, neighbour)
+            self.metrics.observe("candidates", len(candidates))
+            with self.metrics.timer("placement"):
+                placed = self.game_map.place_room_next_to(
+                    room, neighbour, candidates
                 )
-            )
             if placed:
-                self.logger.info(
-                    ("placed ", room.size, "at ", room.origin.y, room.origin.x)
+                self.logger.debug(
+                    "Placed a room of size %s at %s.", room.size, room.origin
                 )
+                self.metrics.count("rooms")
+                self.metrics.observe("tries_per_room", tries)
                 self.to_process.append(room)
-                return
-            tries += 1
+                return Placement(room, room.origin, neighbour)
+            self.metrics.count("rejections.no_candidates")
+        self.logger.debug(
+            "No room fits next to the room at %s.", neighbour.origin
+        )
+        self.metrics.count("rejections.neighbour_exhausted")
         self.to_process.remove(neighbour)
         if __debug__:
             neighbour.fill_border(wall)
+        return None
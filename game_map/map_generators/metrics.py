@@ -0,0 +1,118 @@
+"""Metrics of the map generation.
+
+Generators report counters, timings and distributions of values to their
+metrics. The default NULL_METRICS ignores everything, so the collection costs
+nothing unless GenerationMetrics are passed to the generator."""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator
+
+
+class Distribution:
+    """Summary of observed values which can be merged with another one."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: Distribution) -> None:
+        if other.count == 0:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.total / self.count if self.count else None,
+        }
+
+
+class GenerationMetrics:
+    """Collects counters, the time spent in named phases and distributions of
+    values such as the number of placement candidates."""
+
+    def __init__(self):
+        self.counters = Counter()
+        self.timings: Dict[str, Distribution] = {}
+        self.distributions: Dict[str, Distribution] = {}
+
+    def count(self, name: str, value: int = 1) -> None:
+        self.counters[name] += value
+
+    def observe(self, name: str, value: float) -> None:
+        """Adds a value to the distribution of the given name."""
+        self.distributions.setdefault(name, Distribution()).add(value)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Measures the time spent inside the block under the given name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.setdefault(name, Distribution()).add(
+                time.perf_counter() - start
+            )
+
+    def merge(self, other: GenerationMetrics) -> None:
+        """Adds the metrics of another generation, e.g. of a batch."""
+        self.counters.update(other.counters)
+        for own, others in (
+            (self.timings, other.timings),
+            (self.distributions, other.distributions),
+        ):
+            for name, distribution in others.items():
+                own.setdefault(name, Distribution()).merge(distribution)
+
+    def to_dict(self) -> Dict:
+        return {
+            "counters": dict(self.counters),
+            "timings": {
+                name: timing.to_dict() for name, timing in self.timings.items()
+            },
+            "distributions": {
+                name: distribution.to_dict()
+                for name, distribution in self.distributions.items()
+            },
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+class NullMetrics(GenerationMetrics):
+    """Metrics which ignore everything."""
+
+    def count(self, name: str, value: int = 1) -> None:
+        pass
+
+    def observe(self, name: str, value: float) -> None:
+        pass
+
+    def timer(self, name: str) -> nullcontext:
+        return nullcontext()
+
+    def merge(self, other: GenerationMetrics) -> None:
+        pass
+
+
+NULL_METRICS = NullMetrics()
@@ -0,0 +1,97 @@
+import os
+import pickle
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from game_map.map_generators.cache import MapCache
+from game_map.map_generators.iterable_generators.room_neighbours_generator import (
+    RoomNeighboursGenerator,
+)
+
+
+class TestMapCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = MapCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def generate(self, seed: int):
+        return self.cache.generate(
+            RoomNeighboursGenerator, (40, 40), (0.1, 0.3), 0.3, seed
+        )
+
+    def test_placement_index_not_stored(self):
+        generated = self.generate(1)
+        self.assertIsNotNone(generated.placement_index)
+        restored = pickle.loads(pickle.dumps(generated))
+        self.assertIsNone(restored._placement_index)
+        self.assertIsNotNone(generated._placement_index)
+        np.testing.assert_array_equal(
+            restored.placement_index.free_origins(np.ones((3, 3), dtype=bool)),
+            generated.placement_index.free_origins(np.ones((3, 3), dtype=bool)),
+        )
+
+    def test_hit(self):
+        generated = self.generate(1)
+        cached = self.generate(1)
+        self.assertIsNot(generated, cached)
+        np.testing.assert_array_equal(generated.tiles.tiles, cached.tiles.tiles)
+        self.assertEqual(
+            len(generated.room_graph.vertices), len(cached.room_graph.vertices)
+        )
+        self.assertTrue(
+            all(
+                any(vertex.value is child for child in cached.children)
+                for vertex in cached.room_graph.vertices
+            )
+        )
+
+    def test_random_state_restored(self):
+        random.seed(7)
+        expected = random.random()
+        random.seed(7)
+        self.generate(1)
+        self.assertEqual(random.random(), expected)
+
+    def test_stale_entries(self):
+        for stale in (b"cno_such_module\nMap\n.", b"cgame_map\nNoSuchMap\n."):
+            path = os.path.join(self.directory.name, "stale" + MapCache.SUFFIX)
+            with open(path, "wb") as f:
+                f.write(stale)
+            self.assertIsNone(self.cache.get("stale"))
+            self.assertFalse(os.path.exists(path))
+
+    def test_key(self):
+        key = MapCache.key(
+            RoomNeighboursGenerator, (40, 40), (0.1, 0.3), 0.3, 1
+        )
+        self.assertEqual(
+            key,
+            MapCache.key(RoomNeighboursGenerator, [40, 40], [0.1, 0.3], 0.3, 1),
+        )
+        self.assertNotEqual(
+            key,
+            MapCache.key(RoomNeighboursGenerator, (40, 40), (0.1, 0.3), 0.3, 2),
+        )
+
+    def test_eviction(self):
+        self.generate(1)
+        self.generate(2)
+        size = max(
+            entry.stat().st_size for entry in os.scandir(self.directory.name)
+        )
+        first = MapCache.key(
+            RoomNeighboursGenerator, (40, 40), (0.1, 0.3), 0.3, 1
+        )
+        os.utime(
+            os.path.join(self.directory.name, first + MapCache.SUFFIX), (0, 0)
+        )
+        self.cache.max_bytes = 2 * size
+        self.generate(3)
+        self.assertIsNone(self.cache.get(first))
+        self.assertEqual(len(os.listdir(self.directory.name)), 2)
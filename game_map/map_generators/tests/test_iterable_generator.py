@@ -0,0 +1,75 @@
+import os
+import random
+import tempfile
+import unittest
+from itertools import islice
+
+import numpy as np
+
+from game_map import GameMap
+from game_map.map_generators.iterable_generators.room_neighbours_generator import (
+    RoomNeighboursGenerator,
+)
+
+
+class TestIterGenerate(unittest.TestCase):
+    def test_placements(self):
+        random.seed(4)
+        game_map = GameMap((50, 50))
+        placements = list(
+            RoomNeighboursGenerator(game_map, (0.1, 0.3), 0.5).iter_generate()
+        )
+        self.assertEqual(
+            [placement.room for placement in placements], game_map.children
+        )
+        self.assertIsNone(placements[0].neighbour)
+        for placement in placements[1:]:
+            self.assertEqual(placement.origin, placement.room.origin)
+            self.assertTrue(
+                game_map.room_graph.has_edge(
+                    placement.room, placement.neighbour
+                )
+            )
+
+        random.seed(4)
+        generated = GameMap((50, 50))
+        RoomNeighboursGenerator(generated, (0.1, 0.3), 0.5).generate()
+        generated.draw_children()
+        game_map.draw_children()
+        np.testing.assert_array_equal(
+            generated.tiles.tiles, game_map.tiles.tiles
+        )
+
+    def test_stop_early(self):
+        random.seed(4)
+        game_map = GameMap((50, 50))
+        generator = RoomNeighboursGenerator(game_map, (0.1, 0.3), 0.5)
+        placements = list(islice(generator.iter_generate(), 3))
+        self.assertEqual(len(placements), 3)
+        self.assertEqual(len(game_map.children), 3)
+
+    def test_save_between_placements(self):
+        random.seed(6)
+        generated = GameMap((50, 50))
+        RoomNeighboursGenerator(generated, (0.1, 0.3), 0.5).generate()
+        generated.draw_children()
+
+        random.seed(6)
+        game_map = GameMap((50, 50))
+        generator = RoomNeighboursGenerator(game_map, (0.1, 0.3), 0.5)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "map.bin")
+            for _ in generator.iter_generate():
+                game_map.save(path)
+        game_map.draw_children()
+        self.assertEqual(
+            [room.origin for room in game_map.children],
+            [room.origin for room in generated.children],
+        )
+        np.testing.assert_array_equal(
+            generated.tiles.tiles, game_map.tiles.tiles
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
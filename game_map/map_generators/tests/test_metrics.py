@@ -0,0 +1,67 @@
+import json
+import random
+import unittest
+
+from game_map import GameMap
+from game_map.map_generators.iterable_generators.room_neighbours_generator import (
+    RoomNeighboursGenerator,
+)
+from game_map.map_generators.metrics import NULL_METRICS, GenerationMetrics
+
+
+class TestGenerationMetrics(unittest.TestCase):
+    def test_generation(self):
+        random.seed(1)
+        game_map = GameMap((40, 40))
+        metrics = GenerationMetrics()
+        RoomNeighboursGenerator(game_map, (0.1, 0.3), 0.4, metrics).generate()
+        counters = metrics.counters
+        self.assertEqual(counters["rooms"] + 1, len(game_map.children))
+        self.assertEqual(
+            counters["tries"],
+            counters["rooms"] + counters["rejections.no_candidates"],
+        )
+        self.assertEqual(metrics.timings["generate"].count, 1)
+        self.assertEqual(
+            metrics.timings["fit"].count,
+            metrics.distributions["candidates"].count,
+        )
+        exported = json.loads(metrics.to_json())
+        self.assertEqual(exported["counters"]["rooms"], counters["rooms"])
+        self.assertEqual(
+            exported["distributions"]["tries_per_room"]["total"]
+            + 20 * counters["rejections.neighbour_exhausted"],
+            counters["tries"],
+        )
+
+    def test_same_map(self):
+        maps = []
+        for metrics in (NULL_METRICS, GenerationMetrics()):
+            random.seed(2)
+            game_map = GameMap((40, 40))
+            RoomNeighboursGenerator(
+                game_map, (0.1, 0.3), 0.4, metrics
+            ).generate()
+            maps.append([child.origin for child in game_map.children])
+        self.assertEqual(maps[0], maps[1])
+
+    def test_merge(self):
+        first, second = GenerationMetrics(), GenerationMetrics()
+        first.count("tries", 2)
+        first.observe("candidates", 4)
+        second.count("tries")
+        second.observe("candidates", 1)
+        second.observe("candidates", 7)
+        first.merge(second)
+        self.assertEqual(first.counters["tries"], 3)
+        self.assertEqual(
+            first.distributions["candidates"].to_dict(),
+            {"count": 3, "total": 12, "min": 1, "max": 7, "mean": 4},
+        )
+
+    def test_null_metrics(self):
+        with NULL_METRICS.timer("fit"):
+            NULL_METRICS.count("tries")
+            NULL_METRICS.observe("candidates", 1)
+        self.assertEqual(NULL_METRICS.to_dict()["counters"], {})
+        self.assertEqual(NULL_METRICS.to_dict()["timings"], {})
@@ -0,0 +1,146 @@
+"""Pathfinding over the walkable tiles of a map."""
+
+from collections import OrderedDict
+from typing import Hashable, Iterable
+
+import numpy as np
+import tcod.path
+from numpy.typing import NDArray
+
+from game_map.areas.simple_area import SimpleArea
+from game_map.areas.tiles.supplementaries import Point
+
+# Distance of the tiles which cannot reach any goal.
+UNREACHABLE = np.iinfo(np.int32).max
+
+# Offsets of the steps, staying in place first so ties do not move.
+STEPS = np.array(
+    [
+        [0, 0],
+        [-1, 0],
+        [0, 1],
+        [1, 0],
+        [0, -1],
+        [-1, -1],
+        [-1, 1],
+        [1, 1],
+        [1, -1],
+    ]
+)
+
+
+class Pathfinder:
+    """Finds paths over the walkable tiles of an area with A* and computes
+    Dijkstra distance maps towards goals, which any number of entities can
+    follow. The costs, paths and distance maps are cached until the version
+    of the area or of its tiles changes. The tile types written directly to
+    the tiles bump the version of the tiles, writes to the arrays of the
+    fields are not tracked."""
+
+    def __init__(
+        self,
+        area: SimpleArea,
+        cardinal: int = 2,
+        diagonal: int = 3,
+        max_cached: int = 256,
+    ):
+        self.area = area
+        self.cardinal = cardinal
+        self.diagonal = diagonal
+        self.max_cached = max_cached
+        self._version = None
+        self._cost = None
+        self._paths = OrderedDict()
+        self._distances = OrderedDict()
+
+    def _refresh(self) -> None:
+        version = (self.area.version, self.area.tiles.version)
+        if self._version != version:
+            self._version = version
+            self._cost = None
+            self._paths.clear()
+            self._distances.clear()
+
+    def _cached(self, cache: OrderedDict, key: Hashable, compute) -> NDArray:
+        self._refresh()
+        result = cache.get(key)
+        if result is None:
+            result = cache[key] = compute()
+            result.flags.writeable = False
+            if len(cache) > self.max_cached:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return result
+
+    @property
+    def cost(self) -> NDArray[np.int8]:
+        """The cost of entering every tile, zero for the blocked tiles."""
+        self._refresh()
+        if self._cost is None:
+            self._cost = self.area.tiles.walkable.astype(np.int8)
+            self._cost.flags.writeable = False
+        return self._cost
+
+    def path(self, start: Point, goal: Point) -> NDArray[np.intc]:
+        """Returns the shortest path from the start to the goal including both
+        in shape (<length>, 2). The path is empty if there is none."""
+        start = (int(start.y), int(start.x))
+        goal = (int(goal.y), int(goal.x))
+        return self._cached(
+            self._paths,
+            (start, goal),
+            lambda: tcod.path.path2d(
+                self.cost,
+                start_points=[start],
+                end_points=[goal],
+                cardinal=self.cardinal,
+                diagonal=self.diagonal,
+            ),
+        )
+
+    def _padded_distance_map(self, goals: Iterable[Point]) -> NDArray[np.int32]:
+        """Returns the distance map with an unreachable border around it."""
+        goals = frozenset((int(goal.y), int(goal.x)) for goal in goals)
+
+        def compute():
+            distance = tcod.path.maxarray(
+                (self.area.h + 2, self.area.w + 2), dtype=np.int32
+            )
+            for y, x in goals:
+                distance[y + 1, x + 1] = 0
+            return tcod.path.dijkstra2d(
+                distance,
+                np.pad(self.cost, 1),
+                self.cardinal,
+                self.diagonal,
+                out=distance,
+            )
+
+        return self._cached(self._distances, goals, compute)
+
+    def distance_map(self, goals: Iterable[Point]) -> NDArray[np.int32]:
+        """Returns the cost of the cheapest path from every tile to the
+        nearest goal, UNREACHABLE if there is none."""
+        return self._padded_distance_map(goals)[1:-1, 1:-1]
+
+    def next_steps(
+        self, positions: NDArray[np.int_], goals: Iterable[Point]
+    ) -> NDArray[np.int_]:
+        """Moves all the positions in shape (<number_of_positions>, 2) one step
+        down the distance map of the goals at once. The positions which
+        cannot get closer stay in place."""
+        padded = self._padded_distance_map(goals)
+        positions = np.asarray(positions).reshape(-1, 2)
+        steps = STEPS if self.diagonal else STEPS[:5]
+        candidates = positions[:, None, :] + steps
+        candidate_distances = padded[
+            candidates[..., 0] + 1, candidates[..., 1] + 1
+        ]
+        best = np.argmin(candidate_distances, axis=1)
+        return candidates[np.arange(len(positions)), best]
+
+    def next_step(self, position: Point, goals: Iterable[Point]) -> Point:
+        """Returns the next position from the position towards the goals."""
+        step = self.next_steps(np.array([[position.y, position.x]]), goals)
+        return Point.from_tuple(step[0])
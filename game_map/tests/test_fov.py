@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+import tile_types
+from game_map import GameMap
+from game_map.areas.tiles.supplementaries import Point
+from game_map.fov import FieldOfView
+
+
+class TestFieldOfView(unittest.TestCase):
+    def setUp(self):
+        # A floor split by a wall at column 10.
+        self.game_map = GameMap((20, 30))
+        self.game_map.fill(tile_types.floor)
+        self.game_map.tiles.tiles[:, 10] = tile_types.wall
+        self.game_map.invalidate()
+        self.fov = FieldOfView(self.game_map, radius=6)
+
+    def test_field(self):
+        window, visible = self.fov.field(Point(5, 5))
+        self.assertEqual(window.origin, Point(0, 0))
+        self.assertEqual(window.size, (12, 12))
+        self.assertTrue(visible[5, 10])
+        self.assertFalse(visible[5, 11])
+        self.assertTrue(self.fov.can_see(Point(5, 5), Point(5, 9)))
+        self.assertFalse(self.fov.can_see(Point(5, 5), Point(5, 12)))
+        self.assertFalse(self.fov.can_see(Point(5, 5), Point(19, 5)))
+        self.assertIs(window, self.fov.field(Point(5, 5))[0])
+
+    def test_symmetric(self):
+        positions = [
+            Point(y, x) for y in range(0, 20, 3) for x in range(0, 30, 4)
+        ]
+        for first in positions:
+            for second in positions:
+                self.assertEqual(
+                    self.fov.can_see(first, second),
+                    self.fov.can_see(second, first),
+                )
+
+    def test_update(self):
+        self.fov.update(Point(5, 5))
+        self.fov.update(Point(12, 5))
+        self.assertFalse(self.fov.visible[0, 5])
+        self.assertTrue(self.fov.explored[0, 5])
+        self.assertTrue(self.fov.visible[12, 5])
+        self.assertFalse(self.fov.explored[:, 11:].any())
+        self.assertEqual(len(self.fov.dirty), 2)
+
+    def test_invalidation(self):
+        self.assertFalse(self.fov.can_see(Point(5, 7), Point(5, 12)))
+        self.game_map.tiles.tiles[5, 10] = tile_types.floor
+        self.assertTrue(self.fov.can_see(Point(5, 7), Point(5, 12)))
@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+
+import tile_types
+from game_map import GameMap
+from game_map.areas.simple_area import SimpleArea
+from game_map.areas.tiles.supplementaries import Point
+from game_map.pathfinding import UNREACHABLE, Pathfinder
+
+
+class TestPathfinder(unittest.TestCase):
+    def setUp(self):
+        # A floor with a wall across it except for a gap at the bottom.
+        self.game_map = GameMap((7, 9))
+        self.game_map.fill(tile_types.floor)
+        self.game_map.tiles.tiles[:6, 4] = tile_types.wall
+        self.pathfinder = Pathfinder(self.game_map)
+
+    def test_path(self):
+        path = self.pathfinder.path(Point(0, 0), Point(0, 8))
+        np.testing.assert_array_equal(path[0], [0, 0])
+        np.testing.assert_array_equal(path[-1], [0, 8])
+        self.assertIn([6, 4], path.tolist())
+        self.assertIs(path, self.pathfinder.path(Point(0, 0), Point(0, 8)))
+
+    def test_invalidation(self):
+        path = self.pathfinder.path(Point(0, 0), Point(0, 8))
+        wall = SimpleArea((1, 1))
+        wall.origin = Point(6, 4)
+        wall.fill(tile_types.wall)
+        self.game_map.fill_in(wall)
+        self.assertIsNot(path, self.pathfinder.path(Point(0, 0), Point(0, 8)))
+        self.assertEqual(len(self.pathfinder.path(Point(0, 0), Point(0, 8))), 0)
+        distance = self.pathfinder.distance_map([Point(0, 8)])
+        self.assertEqual(distance[0, 0], UNREACHABLE)
+
+    def test_direct_tile_write(self):
+        path = self.pathfinder.path(Point(0, 0), Point(0, 8))
+        self.assertIn([6, 4], path.tolist())
+        self.game_map.tiles.tiles[6, 4] = tile_types.wall
+        self.assertEqual(len(self.pathfinder.path(Point(0, 0), Point(0, 8))), 0)
+        self.assertFalse(self.pathfinder.cost[6, 4])
+        self.game_map.tiles.tiles[3:5, 4] = tile_types.floor
+        path = self.pathfinder.path(Point(0, 0), Point(0, 8))
+        self.assertNotIn([6, 4], path.tolist())
+        self.assertTrue(set(map(tuple, path.tolist())) & {(3, 4), (4, 4)})
+
+    def test_next_steps(self):
+        goal = Point(0, 8)
+        distance = self.pathfinder.distance_map([goal])
+        self.assertEqual(distance[0, 8], 0)
+        self.assertEqual(distance[0, 4], UNREACHABLE)
+        positions = np.array([[0, 0], [3, 7], [0, 8]])
+        for _ in range(20):
+            steps = self.pathfinder.next_steps(positions, [goal])
+            self.assertTrue(
+                np.all(np.abs(steps - positions) <= 1), (steps, positions)
+            )
+            self.assertTrue(
+                np.all(self.game_map.tiles.walkable[steps[:, 0], steps[:, 1]])
+            )
+            positions = steps
+        np.testing.assert_array_equal(positions, [[0, 8]] * 3)
+        self.assertEqual(self.pathfinder.next_step(Point(1, 8), [goal]), goal)
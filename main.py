@@ -12,6 +12,7 @@ from game_map.map_generators.iterable_generators.room_neighbours_generator impor
     RoomNeighboursGenerator,
 )
 from input_handlers import EventHandler
+from renderer import Renderer
 
 
 def main() -> None:
@@ -27,19 +28,13 @@ def main() -> None:
     event_handler = EventHandler()
 
     player = Entity(5, 15, "@", (255, 50, 50))
-    npc = Entity(int(2), int(screen_width / 2), "g", (255, 255, 255))
+    npc = Entity(
+        int(2), int(screen_width / 2), "g", (255, 255, 255), blocks_movement=True
+    )
     entities = {npc, player}
     game_map = GameMap((map_height, map_width))
 
     generator = RoomNeighboursGenerator(game_map, (0.1, 0.3), 0.5)
-    generator.generate()
-
-    engine = Engine(
-        entities=entities,
-        event_handler=event_handler,
-        game_map=game_map,
-        player=player,
-    )
 
     with tcod.context.new(
         columns=screen_width,
@@ -48,6 +43,19 @@ def main() -> None:
         title="Yet Another Roguelike Tutorial",
     ) as context:
         root_console = tcod.console.Console(width=screen_width, height=screen_height)
+        # The rooms are shown as they are placed.
+        for placement in generator.iter_generate():
+            Renderer.render_area(root_console, placement.room)
+            context.present(root_console)
+            for event in tcod.event.get():
+                event_handler.dispatch(event)
+
+        engine = Engine(
+            entities=entities,
+            event_handler=event_handler,
+            game_map=game_map,
+            player=player,
+        )
         while True:
             engine.render(console=root_console, context=context)
             events = tcod.event.wait()
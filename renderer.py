@@ -1,21 +1,145 @@
+from typing import Iterable, List
+
+import numpy as np
+from numpy.typing import NDArray
 from tcod.console import Console
 
+import tile_types
+from entity import Entity
+from entity_index import EntityIndex
 from game_map.areas.area import Area
+from game_map.fov import FieldOfView
 from game_map.areas.simple_area import SimpleArea
+from game_map.areas.tiles.supplementaries import Point, Rectangle
+
+""" The graphic of tiles outside the mask, the same as a cleared console."""
+BLANK = np.array(
+    (ord(" "), (255, 255, 255), (0, 0, 0)), dtype=tile_types.graphic_dt
+)
+
+""" Brightness of the explored tiles which are not visible."""
+REMEMBERED_BRIGHTNESS = 0.5
 
 
 class Renderer:
+    """Renders an area to a console. The graphics of the area are composited
+    into a background buffer which is updated only where the tiles changed.
+    The console is expected to be kept between frames, so only the changed
+    regions and the cells under the previously drawn entities are uploaded
+    again. With a field of view, only the explored tiles are drawn, dimmed
+    unless they are visible, and only the visible entities."""
 
-    def __init__(self, area: SimpleArea):
+    def __init__(self, area: SimpleArea, fov: FieldOfView = None):
         self.area = area
+        self.fov = fov
+        self.background = np.full(area.size, fill_value=BLANK)
+        self._background_stale = True
+        self._console = None
+        self._entity_cells = (np.empty(0, np.intp), np.empty(0, np.intp))
 
-    def update(self):
+    def update(self) -> List[Rectangle]:
+        """Redraws the area, updates the background buffer and returns the
+        changed regions."""
         if isinstance(self.area, Area):
-            self.area.draw_children()
+            regions = self.area.draw_children()
+        else:
+            regions = [Rectangle(Point(0, 0), self.area.size)]
+        if self.fov is not None:
+            regions += self.fov.dirty
+            self.fov.dirty = []
+        if self._background_stale:
+            regions = [Rectangle(Point(0, 0), self.area.size)]
+            self._background_stale = False
+        for region in regions:
+            window = region.slices()
+            self.background[window] = self._compose(window)
+        return regions
 
-    def render_console(self, console: Console):
-        self.update()
+    def _compose(self, window) -> NDArray:
+        """Returns the graphics of the tiles in the window."""
         tiles = self.area.tiles
-        console.rgb[
-            tiles.mask
-        ] = tiles._tiles["dark"][tiles.mask]
+        graphics = np.where(
+            tiles.mask[window],
+            tile_types.PALETTE.table("dark")[tiles.ids[window]],
+            BLANK,
+        )
+        if self.fov is None:
+            return graphics
+        remembered = ~self.fov.visible[window]
+        for field in ("fg", "bg"):
+            graphics[field][remembered] = (
+                graphics[field][remembered] * REMEMBERED_BRIGHTNESS
+            ).astype(np.uint8)
+        graphics[~self.fov.explored[window]] = BLANK
+        return graphics
+
+    def render_console(
+        self, console: Console, entities: Iterable[Entity] = ()
+    ) -> None:
+        """Renders the area and the entities. An index of the entities is
+        queried only within the console and the field of view."""
+        regions = self.update()
+        bbox = Rectangle(Point(0, 0), console.rgb.shape).intersection(
+            Rectangle(Point(0, 0), self.area.size)
+        )
+        if console is not self._console:
+            console.clear()
+            self._console = console
+            self._entity_cells = (np.empty(0, np.intp), np.empty(0, np.intp))
+            regions = [bbox]
+        for region in regions:
+            window = region.intersection(bbox).slices()
+            console.rgb[window] = self.background[window]
+        console.rgb[self._entity_cells] = self.background[self._entity_cells]
+        if isinstance(entities, EntityIndex):
+            window = bbox
+            if self.fov is not None:
+                window = window.intersection(self.fov.window)
+            entities = entities.in_rectangle(window)
+        self._entity_cells = self._draw_entities(
+            console,
+            entities,
+            bbox,
+            None if self.fov is None else self.fov.visible,
+        )
+
+    @staticmethod
+    def render_area(console: Console, area: SimpleArea) -> None:
+        """Draws the tiles of an area at its origin directly onto the console,
+        e.g. a room just placed by a running generator. The area is not merged
+        into its parent, which would change the parent while generating."""
+        window = Rectangle(area.origin, area.size).intersection(
+            Rectangle(Point(0, 0), console.rgb.shape)
+        )
+        if window.is_empty():
+            return
+        local = window.moved(Point(-area.origin.y, -area.origin.x)).slices()
+        mask = area.tiles.mask[local]
+        console.rgb[window.slices()][mask] = area.tiles.dark[local][mask]
+
+    @staticmethod
+    def _draw_entities(
+        console: Console,
+        entities: Iterable[Entity],
+        bbox: Rectangle,
+        visible: NDArray[np.bool_] = None,
+    ) -> (NDArray[np.intp], NDArray[np.intp]):
+        """Draws all the entities inside the bounding box, and visible if
+        given, in one vectorized write and returns their cells."""
+        entities = list(entities)
+        ys = np.array([entity.y for entity in entities], dtype=np.intp)
+        xs = np.array([entity.x for entity in entities], dtype=np.intp)
+        chars = np.array([ord(entity.char) for entity in entities], np.int32)
+        colors = np.array([entity.color for entity in entities], np.uint8)
+        inside = (
+            (bbox.origin.y <= ys)
+            & (ys < bbox.end.y)
+            & (bbox.origin.x <= xs)
+            & (xs < bbox.end.x)
+        )
+        if visible is not None:
+            inside[inside] = visible[ys[inside], xs[inside]]
+        cells = (ys[inside], xs[inside])
+        console.rgb["ch"][cells] = chars[inside]
+        console.rgb["fg"][cells] = colors[inside].reshape(-1, 3)
+        return cells
@@ -0,0 +1,310 @@
+"""Benchmarks of the hot paths of the map generation.
+
+Every benchmark runs with a fixed seed on square maps of the given sizes. The
+results are written as JSON and can be compared against a saved baseline:
+
+    python scripts/benchmark.py -o baseline.json
+    python scripts/benchmark.py --baseline baseline.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import timeit
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from game_map import GameMap
+from game_map.areas.random_simple_areas import DimensionRange
+from game_map.areas.rooms.rooms import ROOM_PROTOTYPES, LRoom, Room
+from game_map.areas.tiles.bit_mask import BitMask
+from game_map.areas.tiles.morphology.distance import (
+    DistanceMetric,
+    distance_transform,
+)
+from game_map.areas.tiles.morphology.operations import hit_or_miss, shifted
+from game_map.areas.tiles.morphology.structural_element import corner_se
+from game_map.areas.tiles.supplementaries import Point
+from game_map.areas.tiles.tiles import Tiles
+from game_map.direction.direction import Direction
+from game_map.map_generators.iterable_generators.room_neighbours_generator import (
+    RoomNeighboursGenerator,
+)
+
+SEED = 0
+SIZES = (70, 250, 500, 1000, 2000)
+ROOM_SIZE_FACTORS = (0.1, 0.3)
+DENSITY = 0.5
+
+# A benchmark prepares its input for a map size and returns the timed call.
+Benchmark = Callable[[Tuple[int, int]], Callable[[], object]]
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str) -> Callable[[Benchmark], Benchmark]:
+    def register(function: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = function
+        return function
+
+    return register
+
+
+def occupied_tiles(size: Tuple[int, int]) -> Tiles:
+    """Returns tiles with random rectangles made unplaceable, roughly like a
+    map in the middle of the generation."""
+    tiles = Tiles(size)
+    dim_range = DimensionRange.from_size(size, ROOM_SIZE_FACTORS)
+    for _ in range(20):
+        h, w = dim_range.sample()
+        y = random.randrange(0, size[0] - h + 1)
+        x = random.randrange(0, size[1] - w + 1)
+        tiles.placable[y : y + h, x : x + w] = False
+    return tiles
+
+
+def room_to_fit(size: Tuple[int, int]) -> LRoom:
+    return LRoom(DimensionRange.from_size(size, ROOM_SIZE_FACTORS).sample())
+
+
+@benchmark("tiles.fit_in")
+def bench_fit_in(size):
+    tiles = occupied_tiles(size)
+    to_fit = room_to_fit(size).tiles
+    return lambda: tiles.fit_in(to_fit)
+
+
+@benchmark("tiles.fit_in_touching")
+def bench_fit_in_touching(size):
+    tiles = occupied_tiles(size)
+    to_fit = room_to_fit(size).tiles
+    room = room_to_fit(size)
+    room.origin = Point(size[0] // 3, size[1] // 3)
+    anchor = room.stretched(size).tiles
+    return lambda: tiles.fit_in_touching(to_fit, anchor, Direction.NORTH)
+
+
+@benchmark("tiles.inner_border")
+def bench_inner_border(size):
+    tiles = LRoom(size).tiles
+    return lambda: tiles.inner_border()
+
+
+@benchmark("tiles.corners")
+def bench_corners(size):
+    tiles = LRoom(size).tiles
+    return lambda: tiles.corners(Direction.NORTH)
+
+
+@benchmark("morphology.hit_or_miss")
+def bench_hit_or_miss(size):
+    mask = LRoom(size).tiles.placable
+    se = corner_se(Direction.WEST)
+    return lambda: hit_or_miss(mask, se)
+
+
+def mask_algebra(first, second):
+    """Unites, subtracts, intersects, shifts and counts the masks."""
+    union = first | second
+    difference = first & ~second
+    return np.count_nonzero(
+        shifted(union, np.array((1, 1))) & difference
+    ) + np.count_nonzero(difference)
+
+
+def bit_mask_algebra(first: BitMask, second: BitMask):
+    union = first | second
+    difference = first - second
+    return (union.shifted(1, 1) & difference).count() + difference.count()
+
+
+@benchmark("mask.algebra")
+def bench_mask_algebra(size):
+    first = occupied_tiles(size).placable
+    second = LRoom(size).tiles.placable
+    return lambda: mask_algebra(first, second)
+
+
+@benchmark("bit_mask.algebra")
+def bench_bit_mask_algebra(size):
+    first = BitMask.from_array(occupied_tiles(size).placable)
+    second = BitMask.from_array(LRoom(size).tiles.placable)
+    return lambda: bit_mask_algebra(first, second)
+
+
+@benchmark("morphology.distance_transform")
+def bench_distance_transform(size):
+    mask = occupied_tiles(size).placable
+    return lambda: [
+        distance_transform(mask, metric) for metric in DistanceMetric
+    ]
+
+
+@benchmark("area.fit_next_to")
+def bench_fit_next_to(size):
+    game_map = GameMap(size)
+    neighbour = room_to_fit(size)
+    neighbour.origin = Point(
+        (size[0] - neighbour.h) // 2, (size[1] - neighbour.w) // 2
+    )
+    game_map.place_in(neighbour)
+    to_place = room_to_fit(size)
+    return lambda: game_map.fit_next_to(to_place, neighbour, Direction.EAST)
+
+
+@benchmark("room.construct")
+def bench_room(size):
+    return lambda: Room(size)
+
+
+@benchmark("lroom.construct")
+def bench_lroom(size):
+    return lambda: LRoom(size, Direction.NORTH)
+
+
+@benchmark("lroom.prototype")
+def bench_lroom_prototype(size):
+    return lambda: LRoom.from_prototype(size, Direction.NORTH)
+
+
+def generate(size: Tuple[int, int]) -> None:
+    game_map = GameMap(size)
+    RoomNeighboursGenerator(game_map, ROOM_SIZE_FACTORS, DENSITY).generate()
+
+
+# Generation from scratch, the room prototypes are built in every run.
+@benchmark("generator.generate")
+def bench_generate(size):
+    def cold():
+        ROOM_PROTOTYPES.clear()
+        generate(size)
+
+    return cold
+
+
+# Generation with the room prototypes left by a run with the same seed, as
+# when the same level is generated again.
+@benchmark("generator.generate_warm")
+def bench_generate_warm(size):
+    ROOM_PROTOTYPES.clear()
+    random.seed(SEED)
+    generate(size)
+    return lambda: generate(size)
+
+
+def measure(
+    function: Benchmark, size: Tuple[int, int], repeat: int
+) -> Dict[str, float]:
+    """Times the benchmark. Every run starts from the same seed, fast calls
+    are looped so a run lasts at least 0.2 s."""
+    random.seed(SEED)
+    call = function(size)
+
+    def seeded():
+        random.seed(SEED)
+        call()
+
+    timer = timeit.Timer(seeded)
+    number, _ = timer.autorange()
+    times = [time / number for time in timer.repeat(repeat, number)]
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def run(names: List[str], sizes: List[int], repeat: int) -> Dict:
+    results = []
+    for name in names:
+        for size in sizes:
+            result = measure(BENCHMARKS[name], (size, size), repeat)
+            result.update(name=name, size=[size, size])
+            results.append(result)
+            print(
+                f"{name:24} {size:5}x{size:<5} {result['min'] * 1e3:12.3f} ms",
+                file=sys.stderr,
+            )
+    return {
+        "meta": {
+            "seed": SEED,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "debug": __debug__,
+        },
+        "results": results,
+    }
+
+
+def compare(report: Dict, baseline: Dict, threshold: float) -> bool:
+    """Prints the ratio of every result to its baseline and returns whether
+    any result is slower than the baseline by more than the threshold."""
+    baseline_results = {
+        (result["name"], tuple(result["size"])): result
+        for result in baseline["results"]
+    }
+    regressed = False
+    for result in report["results"]:
+        key = (result["name"], tuple(result["size"]))
+        if key not in baseline_results:
+            continue
+        ratio = result["min"] / baseline_results[key]["min"]
+        slower = ratio > 1 + threshold
+        regressed |= slower
+        print(
+            f"{key[0]:24} {key[1][0]:5}x{key[1][1]:<5} {ratio:8.2f}x"
+            + (" REGRESSION" if slower else ""),
+            file=sys.stderr,
+        )
+    return regressed
+
+
+def get_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-o", "--output", help="File to write the results to as JSON."
+    )
+    parser.add_argument(
+        "--baseline", help="Results to compare with, written by --output."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative slowdown reported as a regression.",
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=SIZES, help="Map sizes."
+    )
+    parser.add_argument(
+        "--filter",
+        nargs="+",
+        default=list(BENCHMARKS),
+        choices=list(BENCHMARKS),
+        help="Benchmarks to run.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Number of timed runs."
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = get_args()
+    report = run(args.filter, args.sizes, args.repeat)
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            sys.exit(1)
@@ -1,30 +1,209 @@
 import argparse
+import json
+import os
+import random
+import time
+from functools import partial
+from multiprocessing import Pool
+from typing import Optional, Tuple
 
 from tcod import tcod
 
 from game_map import GameMap
+from game_map.map_generators.cache import MapCache
 from game_map.map_generators.iterable_generators.room_neighbours_generator import (
     RoomNeighboursGenerator,
 )
+from game_map.map_generators.metrics import NULL_METRICS, GenerationMetrics
 from renderer import Renderer
 
 
 def get_args():
     parser = argparse.ArgumentParser(add_help=False)
-    parser.add_argument("output_file", help="The text file to save the map to.")
+    parser.add_argument(
+        "output",
+        help="The text file to save the map to. In the batch mode the "
+        "directory to save the maps to.",
+    )
     parser.add_argument("-w", type=int, help="Width of the map.", default=70)
     parser.add_argument("-h", type=int, help="Height of the map.", default=70)
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Seed of the map. In the batch mode the first seed of the range.",
+        default=None,
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        help="Generates the given number of maps with consecutive seeds in "
+        "the batch mode.",
+        default=None,
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Number of processes of the batch mode.",
+        default=os.cpu_count(),
+    )
+    parser.add_argument(
+        "--cache",
+        help="Directory of the cache of generated maps. Only seeded maps are "
+        "cached.",
+        default=None,
+    )
+    parser.add_argument(
+        "--binary",
+        action="store_true",
+        help="Saves the maps in the binary map format instead of text.",
+    )
+    parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="Overwrites the existing maps. In the batch mode the existing "
+        "maps are skipped otherwise.",
+    )
+    parser.add_argument(
+        "--metrics",
+        help="The JSON file to save the generation metrics to. In the batch "
+        "mode the metrics of all the maps are summed up.",
+        default=None,
+    )
     return parser.parse_args()
 
 
-if __name__ == "__main__":
-    args = get_args()
-    game_map = GameMap((args.h, args.w))
-    generator = RoomNeighboursGenerator(game_map, (0.1, 0.3), 0.5)
-    generator.generate()
+def generate_map(
+    size: Tuple[int, int],
+    seed: int = None,
+    cache_dir: str = None,
+    metrics: GenerationMetrics = NULL_METRICS,
+) -> GameMap:
+    """Generates a map or takes it from the cache."""
+    if cache_dir is not None and seed is not None:
+        game_map = MapCache(cache_dir).generate(
+            RoomNeighboursGenerator, size, (0.1, 0.3), 0.5, seed, metrics
+        )
+    else:
+        if seed is not None:
+            random.seed(seed)
+        game_map = GameMap(size)
+        generator = RoomNeighboursGenerator(game_map, (0.1, 0.3), 0.5, metrics)
+        generator.generate()
+    return game_map
+
+
+def write_map(
+    game_map: GameMap,
+    path: str,
+    binary: bool = False,
+    overwrite: bool = False,
+) -> None:
+    """Writes the map as text or in the binary map format. An existing file
+    is only overwritten on request."""
+    if not overwrite and os.path.exists(path):
+        raise FileExistsError(path)
+    if binary:
+        game_map.save(path)
+        return
     renderer = Renderer(game_map)
-    root_console = tcod.console.Console(width=args.h, height=args.w)
+    root_console = tcod.console.Console(width=game_map.w, height=game_map.h)
     renderer.render_console(root_console)
-
-    with open(args.output_file, "x") as f:
+    with open(path, "w" if overwrite else "x") as f:
         f.write(root_console.__str__())
+
+
+def save_map(
+    size: Tuple[int, int],
+    output_dir: str,
+    cache_dir: str,
+    binary: bool,
+    overwrite: bool,
+    seed: int,
+) -> Tuple[GenerationMetrics, Optional[str]]:
+    """Generates a map of the given seed into the output directory. Returns
+    the metrics of the generation and a note when the map was skipped or
+    failed, a failure of one map does not stop the batch."""
+    metrics = GenerationMetrics()
+    extension = "map" if binary else "txt"
+    path = os.path.join(output_dir, f"map_{seed}.{extension}")
+    if not overwrite and os.path.exists(path):
+        return metrics, f"skipped {path}, it already exists"
+    try:
+        write_map(
+            generate_map(size, seed, cache_dir, metrics),
+            path,
+            binary,
+            overwrite,
+        )
+    except FileExistsError:
+        return metrics, f"skipped {path}, it already exists"
+    except Exception as error:
+        return metrics, f"failed {path}: {error!r}"
+    return metrics, None
+
+
+def generate_batch(
+    size: Tuple[int, int],
+    output_dir: str,
+    seeds: range,
+    jobs: int,
+    cache_dir: str = None,
+    binary: bool = False,
+    overwrite: bool = False,
+) -> GenerationMetrics:
+    """Generates the maps of all the seeds over a pool of processes. Every map
+    is saved as soon as it is finished, the skipped and failed maps are
+    reported at the end. Returns the summed up metrics."""
+    os.makedirs(output_dir, exist_ok=True)
+    metrics = GenerationMetrics()
+    notes = []
+    start = time.perf_counter()
+    with Pool(processes=jobs) as pool:
+        for done, (map_metrics, note) in enumerate(
+            pool.imap_unordered(
+                partial(
+                    save_map, size, output_dir, cache_dir, binary, overwrite
+                ),
+                seeds,
+            ),
+            start=1,
+        ):
+            metrics.merge(map_metrics)
+            if note is not None:
+                notes.append(note)
+            elapsed = time.perf_counter() - start
+            print(
+                f"\r{done}/{len(seeds)} maps, {done / elapsed:.2f} maps/s",
+                end="",
+                flush=True,
+            )
+    print()
+    for note in sorted(notes):
+        print(note)
+    return metrics
+
+
+if __name__ == "__main__":
+    args = get_args()
+    if args.count is None:
+        metrics = GenerationMetrics()
+        write_map(
+            generate_map((args.h, args.w), args.seed, args.cache, metrics),
+            args.output,
+            args.binary,
+            args.overwrite,
+        )
+    else:
+        first_seed = 0 if args.seed is None else args.seed
+        metrics = generate_batch(
+            (args.h, args.w),
+            args.output,
+            range(first_seed, first_seed + args.count),
+            args.jobs,
+            args.cache,
+            args.binary,
+            args.overwrite,
+        )
+    if args.metrics is not None:
+        with open(args.metrics, "w") as f:
+            json.dump(metrics.to_dict(), f, indent=2)
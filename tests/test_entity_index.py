@@ -0,0 +1,73 @@
+import unittest
+from types import SimpleNamespace
+
+from actions import MovementAction
+from entity import Entity
+from entity_index import EntityIndex
+from game_map import GameMap
+from game_map.areas.rooms.rooms import Room
+from game_map.areas.tiles.supplementaries import Point, Rectangle
+
+
+class TestEntityIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = EntityIndex((40, 50), bucket_size=8)
+        self.player = Entity(5, 6, "@", (255, 50, 50))
+        self.npc = Entity(5, 7, "g", (255, 255, 255), blocks_movement=True)
+        self.index.update([self.player, self.npc])
+
+    def test_lookup(self):
+        self.assertEqual(self.index.at(Point(5, 6)), [self.player])
+        self.assertEqual(self.index.at(Point(6, 6)), [])
+        self.assertTrue(self.index.blocking_at(Point(5, 7)))
+        self.assertFalse(self.index.blocking_at(Point(5, 6)))
+
+    def test_move_updates_index(self):
+        self.npc.move(10, 20)
+        self.assertEqual(self.index.at(Point(5, 7)), [])
+        self.assertEqual(self.index.at(Point(15, 27)), [self.npc])
+        self.assertEqual(
+            set(self.index.in_rectangle(Rectangle(Point(8, 8), (10, 30)))),
+            {self.npc},
+        )
+
+    def test_range_query_matches_scan(self):
+        entities = [Entity(y, 3 * y % 50, "g", (0, 0, 0)) for y in range(40)]
+        self.index.update(entities)
+        everything = list(self.index)
+        for rectangle in (
+            Rectangle(Point(0, 0), (40, 50)),
+            Rectangle(Point(3, 9), (17, 20)),
+            Rectangle(Point(-5, 45), (20, 20)),
+            Rectangle(Point(10, 10), (0, 5)),
+        ):
+            expected = {
+                entity
+                for entity in everything
+                if rectangle.origin.y <= entity.y < rectangle.end.y
+                and rectangle.origin.x <= entity.x < rectangle.end.x
+            }
+            self.assertEqual(set(self.index.in_rectangle(rectangle)), expected)
+
+    def test_remove(self):
+        self.index.remove(self.npc)
+        self.assertNotIn(self.npc, self.index)
+        self.assertIsNone(self.npc.index)
+        self.npc.move(1, 1)
+        self.assertEqual(self.index.at(Point(6, 8)), [])
+
+    def test_blocked_movement(self):
+        game_map = GameMap((40, 50))
+        room = Room((10, 10))
+        room.origin = Point(1, 1)
+        game_map.place_in(room)
+        game_map.draw_children()
+        engine = SimpleNamespace(game_map=game_map, entities=self.index)
+        MovementAction(0, 1).perform(engine, self.player)
+        self.assertEqual((self.player.y, self.player.x), (5, 6))
+        MovementAction(1, 1).perform(engine, self.player)
+        self.assertEqual(self.index.at(Point(6, 7)), [self.player])
+
+
+if __name__ == "__main__":
+    unittest.main()
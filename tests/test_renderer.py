@@ -0,0 +1,90 @@
+import unittest
+
+import numpy as np
+from tcod.console import Console
+
+import tile_types
+from entity import Entity
+from game_map import GameMap
+from game_map.areas.rooms.rooms import Room
+from game_map.areas.tiles.supplementaries import Point
+from game_map.fov import FieldOfView
+from renderer import BLANK, Renderer
+
+
+def render_from_scratch(game_map: GameMap, entities) -> Console:
+    console = Console(game_map.w, game_map.h)
+    mask = game_map.tiles.mask
+    console.rgb[mask] = game_map.tiles.tiles["dark"][mask]
+    for entity in entities:
+        console.print(
+            y=entity.y, x=entity.x, string=entity.char, fg=entity.color
+        )
+    return console
+
+
+class TestRenderer(unittest.TestCase):
+    def test_frames_match_full_render(self):
+        game_map = GameMap((20, 30))
+        room = Room((6, 8))
+        room.origin = Point(3, 4)
+        game_map.place_in(room)
+        player = Entity(5, 6, "@", (255, 50, 50))
+        npc = Entity(6, 7, "g", (255, 255, 255))
+        renderer = Renderer(game_map)
+        console = Console(30, 20)
+
+        renderer.render_console(console, [player, npc])
+        np.testing.assert_array_equal(
+            console.rgb, render_from_scratch(game_map, [player, npc]).rgb
+        )
+
+        player.move(0, 1)
+        room.fill_border(tile_types.red)
+        renderer.render_console(console, [player, npc])
+        np.testing.assert_array_equal(
+            console.rgb, render_from_scratch(game_map, [player, npc]).rgb
+        )
+
+    def test_field_of_view(self):
+        game_map = GameMap((20, 30))
+        room = Room((6, 16))
+        room.origin = Point(3, 4)
+        game_map.place_in(room)
+        game_map.draw_children()
+        fov = FieldOfView(game_map, radius=4)
+        player = Entity(5, 16, "@", (255, 50, 50))
+        far = Entity(15, 25, "g", (255, 255, 255))
+        renderer = Renderer(game_map, fov)
+        console = Console(30, 20)
+
+        fov.update(Point(5, 6))
+        fov.update(Point(5, 16))
+        renderer.render_console(console, [player, far])
+        graphics = game_map.tiles.tiles["dark"]
+        self.assertEqual(console.rgb["ch"][5, 16], ord("@"))
+        self.assertEqual(console.rgb[15, 25], BLANK)
+        self.assertEqual(console.rgb[5, 15], graphics[5, 15])
+        self.assertFalse(fov.visible[5, 7])
+        self.assertTrue(fov.explored[5, 7])
+        np.testing.assert_array_equal(
+            console.rgb["bg"][5, 7], graphics["bg"][5, 7] // 2
+        )
+
+        player.move(1, 0)
+        fov.update(Point(6, 16))
+        renderer.render_console(console, [player, far])
+        reference = Renderer(game_map, fov)
+        reference_console = Console(30, 20)
+        reference.render_console(reference_console, [player, far])
+        np.testing.assert_array_equal(console.rgb, reference_console.rgb)
+
+    def test_render_area(self):
+        room = Room((6, 8))
+        room.origin = Point(3, 25)
+        console = Console(30, 20)
+        Renderer.render_area(console, room)
+        graphics = room.tiles.dark
+        self.assertEqual(console.rgb[3, 25], graphics[0, 0])
+        self.assertEqual(console.rgb[4, 26], graphics[1, 1])
+        self.assertEqual(console.rgb[3, 24], BLANK)
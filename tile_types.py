@@ -1,6 +1,7 @@
-from typing import Tuple
+from typing import Dict, Tuple
 
 import numpy as np
+from numpy.typing import NDArray
 
 graphic_dt = np.dtype(
     [
@@ -22,6 +23,90 @@ tile_dt = np.dtype(
     ]
 )
 
+""" The compact tile stored by Tiles.
+    id: Index of the tile type in the palette, which defines the other fields
+    of tile_dt."""
+cell_dt = np.dtype(
+    [
+        ("id", np.uint8),
+        ("mask", np.bool_),
+        ("placeable", np.bool_),
+    ]
+)
+
+""" Fields of tile_dt stored in every tile instead of the tile type."""
+CELL_FIELDS = ("mask", "placeable")
+
+
+class Palette:
+    """Distinct tile types indexed by their ids. A tile type is a tile with
+    the mask and placeable fields set, the tiles with other values of these
+    fields share its id. The types are added on their first use, so the ids
+    depend on the order of use and are stored along saved tiles."""
+
+    def __init__(self):
+        self.records = np.empty(0, dtype=tile_dt)
+        self._ids: Dict[bytes, int] = {}
+        self._tables: Dict[str, NDArray] = {}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _id(self, key: bytes) -> int:
+        tile_id = self._ids.get(key)
+        if tile_id is None:
+            if len(self._ids) > np.iinfo(np.uint8).max:
+                raise ValueError("Too many tile types.")
+            tile_id = self._ids[key] = len(self._ids)
+            self.records = np.append(
+                self.records, np.frombuffer(key, dtype=tile_dt)
+            )
+            self._tables = {}
+        return tile_id
+
+    def ids(self, tiles: NDArray) -> NDArray[np.uint8]:
+        """Returns the ids of an array of tile_dt, adding the new types."""
+        types = np.array(tiles, dtype=tile_dt)
+        types["mask"] = True
+        types["placeable"] = True
+        if types.ndim == 0:
+            return np.array(self._id(types.tobytes()), dtype=np.uint8)
+        unique, inverse = np.unique(
+            types.reshape(-1).view(f"V{tile_dt.itemsize}"), return_inverse=True
+        )
+        ids = np.array(
+            [self._id(key.tobytes()) for key in unique], dtype=np.uint8
+        )
+        return ids[inverse].reshape(types.shape)
+
+    def cells(self, tiles: NDArray) -> NDArray:
+        """Returns an array of tile_dt as an array of cell_dt."""
+        tiles = np.asarray(tiles, dtype=tile_dt)
+        cells = np.empty(tiles.shape, dtype=cell_dt)
+        cells["id"] = self.ids(tiles)
+        for name in CELL_FIELDS:
+            cells[name] = tiles[name]
+        return cells
+
+    def records_of(self, cells: NDArray) -> NDArray:
+        """Returns an array of cell_dt as a new array of tile_dt."""
+        cells = np.asarray(cells, dtype=cell_dt)
+        records = self.records[cells["id"].reshape(-1)].reshape(cells.shape)
+        for name in CELL_FIELDS:
+            records[name] = cells[name]
+        return records
+
+    def table(self, name: str) -> NDArray:
+        """Returns a read-only lookup table of a field of tile_dt by ids."""
+        table = self._tables.get(name)
+        if table is None:
+            table = self._tables[name] = self.records[name].copy()
+            table.flags.writeable = False
+        return table
+
+
+PALETTE = Palette()
+
 
 def new_tile(
     *,
@@ -30,7 +115,9 @@ def new_tile(
     dark: Tuple[int, Tuple[int, int, int], Tuple[int, int, int]],
 ) -> np.ndarray:
     """Helper function for defining individual tile types"""
-    return np.array((True, True, walkable, transparent, dark), dtype=tile_dt)
+    tile = np.array((True, True, walkable, transparent, dark), dtype=tile_dt)
+    PALETTE.ids(tile)
+    return tile
 
 
 floor = new_tile(
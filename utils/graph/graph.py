@@ -1,25 +1,143 @@
-from typing import Any, List
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 from utils.graph.node import Node
 
 
 class Graph:
+    """Graph of hashable elements with their neighbours. The vertices are
+    indexed by their elements, so lookups and insertions take constant time
+    and the algorithms run in linear time of the vertices and the edges."""
+
     def __init__(self):
-        self.vertices: List[Node] = []
+        self._nodes: Dict[Any, Node] = {}
+
+    @property
+    def vertices(self) -> List[Node]:
+        return list(self._nodes.values())
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, element: Any) -> bool:
+        return element in self._nodes
 
-    def push(self, element: Any, neighbours: List[Any] = None) -> None:
-        new_node = Node(element)
-        for neighbour in neighbours:
-            new_node.add_neighbour(neighbour)
-        self.vertices.append(new_node)
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._nodes)
+
+    def _node(self, element: Any) -> Node:
+        """Returns the node of the element, it is created if missing."""
+        node = self._nodes.get(element)
+        if node is None:
+            node = self._nodes[element] = Node(element)
+        return node
+
+    def push(self, element: Any, neighbours: Iterable[Any] = None) -> None:
+        """Adds the element with its neighbours. The neighbours of an element
+        already in the graph are extended."""
+        node = self._node(element)
+        for neighbour in neighbours or ():
+            node.add_neighbour(neighbour)
 
     def add_neighbour_to(self, element: Any, neighbour: Any) -> None:
-        for vertex in self.vertices:
-            if vertex.value == element:
-                vertex.add_neighbour(neighbour)
+        """Adds a neighbour to an element in the graph."""
+        node = self._nodes.get(element)
+        if node is not None:
+            node.add_neighbour(neighbour)
+
+    def add_edge(self, first: Any, second: Any) -> None:
+        """Connects the elements in both directions, adding the missing
+        ones."""
+        self._node(first).add_neighbour(second)
+        self._node(second).add_neighbour(first)
+
+    def remove_edge(self, first: Any, second: Any) -> None:
+        for element, neighbour in ((first, second), (second, first)):
+            node = self._nodes.get(element)
+            if node is not None:
+                node.remove_neighbour(neighbour)
+
+    def has_edge(self, first: Any, second: Any) -> bool:
+        node = self._nodes.get(first)
+        return node is not None and node.has_neighbour(second)
 
     def get_neighbours(self, element: Any) -> List[Any]:
-        for vertex in self.vertices:
-            if vertex.value == element:
-                return vertex.neighbours
-        return []
+        node = self._nodes.get(element)
+        if node is None:
+            return []
+        return node.neighbours
+
+    def _neighbours(self, element: Any) -> Iterable[Any]:
+        node = self._nodes.get(element)
+        return () if node is None else node._neighbours
+
+    def bfs_distances(self, source: Any) -> Dict[Any, int]:
+        """Returns the number of edges from the source to every reachable
+        element."""
+        distances = {source: 0}
+        queue = deque((source,))
+        while queue:
+            element = queue.popleft()
+            distance = distances[element] + 1
+            for neighbour in self._neighbours(element):
+                if neighbour not in distances:
+                    distances[neighbour] = distance
+                    queue.append(neighbour)
+        return distances
+
+    def connected_components(self) -> List[List[Any]]:
+        """Returns the elements split into connected components. The edges
+        are taken as undirected. The components are in the order of their
+        first elements."""
+        parents: Dict[Any, Any] = {}
+
+        def find(element: Any) -> Any:
+            root = parents.setdefault(element, element)
+            while root != parents[root]:
+                root = parents[root]
+            while element != root:
+                parents[element], element = root, parents[element]
+            return root
+
+        for element, node in self._nodes.items():
+            find(element)
+            for neighbour in node._neighbours:
+                first, second = find(element), find(neighbour)
+                if first != second:
+                    parents[second] = first
+        components: Dict[Any, List[Any]] = {}
+        for element in parents:
+            components.setdefault(find(element), []).append(element)
+        return list(components.values())
+
+    def spanning_tree(self, root: Any = None) -> Graph:
+        """Returns a breadth first spanning forest with undirected edges. The
+        tree of the root is built first, the roots of the other components are
+        their first elements."""
+        tree = Graph()
+        roots = list(self._nodes)
+        if root is not None:
+            roots.insert(0, root)
+        for start in roots:
+            if start in tree:
+                continue
+            tree.push(start)
+            queue = deque((start,))
+            while queue:
+                element = queue.popleft()
+                for neighbour in self._neighbours(element):
+                    if neighbour not in tree:
+                        tree.add_edge(element, neighbour)
+                        queue.append(neighbour)
+        return tree
+
+    def insert_cycle(self, first: Any, second: Any) -> Optional[int]:
+        """Connects two elements and returns the length of the cycle created
+        by the new edge, or None if they were not connected before."""
+        if first == second or self.has_edge(first, second):
+            raise ValueError("Elements are already connected by an edge.")
+        length = self.bfs_distances(first).get(second)
+        self.add_edge(first, second)
+        return None if length is None else length + 1
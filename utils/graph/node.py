@@ -1,12 +1,26 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Dict, List
 
 
 class Node:
     def __init__(self, value: Any):
         self.value = value
-        self.neighbours = []
+        # Insertion ordered set of the neighbouring values.
+        self._neighbours: Dict[Any, None] = {}
 
-    def add_neighbour(self, neighbour: Node) -> None:
-        self.neighbours.append(neighbour)
+    @property
+    def neighbours(self) -> List[Any]:
+        return list(self._neighbours)
+
+    def add_neighbour(self, neighbour: Any) -> None:
+        self._neighbours[neighbour] = None
+
+    def remove_neighbour(self, neighbour: Any) -> None:
+        self._neighbours.pop(neighbour, None)
+
+    def has_neighbour(self, neighbour: Any) -> bool:
+        return neighbour in self._neighbours
+
+    def degree(self) -> int:
+        return len(self._neighbours)
@@ -0,0 +1,58 @@
+import unittest
+
+from utils.graph.graph import Graph
+
+
+def path_graph(length: int) -> Graph:
+    graph = Graph()
+    for i in range(length - 1):
+        graph.add_edge(i, i + 1)
+    return graph
+
+
+class TestGraph(unittest.TestCase):
+    def test_push(self):
+        graph = Graph()
+        graph.push("a")
+        graph.push("b", ["a"])
+        graph.push("b", ["c"])
+        graph.add_neighbour_to("a", "b")
+        graph.add_neighbour_to("missing", "a")
+        self.assertEqual(list(graph), ["a", "b"])
+        self.assertEqual(graph.get_neighbours("a"), ["b"])
+        self.assertEqual(graph.get_neighbours("b"), ["a", "c"])
+        self.assertEqual(graph.get_neighbours("missing"), [])
+
+    def test_bfs_distances(self):
+        graph = path_graph(5)
+        graph.add_edge(0, 4)
+        self.assertEqual(graph.bfs_distances(0), {0: 0, 1: 1, 4: 1, 2: 2, 3: 2})
+
+    def test_connected_components(self):
+        graph = path_graph(3)
+        graph.add_edge("a", "b")
+        graph.push("c")
+        graph.push(5, [6])
+        self.assertEqual(
+            graph.connected_components(),
+            [[0, 1, 2], ["a", "b"], ["c"], [5, 6]],
+        )
+
+    def test_spanning_tree(self):
+        graph = path_graph(4)
+        graph.add_edge(0, 3)
+        graph.add_edge(1, 3)
+        graph.add_edge("a", "b")
+        tree = graph.spanning_tree(root=3)
+        self.assertEqual(set(tree), set(graph))
+        edges = sum(len(tree.get_neighbours(element)) for element in tree) // 2
+        self.assertEqual(edges, len(graph) - 2)
+        self.assertEqual(tree.bfs_distances(3), graph.bfs_distances(3))
+
+    def test_insert_cycle(self):
+        graph = path_graph(5)
+        self.assertEqual(graph.insert_cycle(0, 4), 5)
+        self.assertTrue(graph.has_edge(4, 0))
+        self.assertIsNone(graph.insert_cycle(0, "other"))
+        with self.assertRaises(ValueError):
+            graph.insert_cycle(1, 2)